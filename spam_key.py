@@ -3,6 +3,13 @@
 Run without arguments to open the GUI (double-click friendly). Example CLI usage:
     python spam_key.py --mode key --key space --interval 0.1 --duration 10 --start-delay 3 --hold 0
     python spam_key.py --mode click --button left --interval 0.05 --duration 5 --hold 0
+    python spam_key.py --job key:a@0.1 --job key:b@0.37 --job click:left@1 --duration 30
+    python spam_key.py --mode sequence --sequence rotation.txt --repeat 0 --duration 60
+    python spam_key.py --daemon --duration 0   # then: python spam_key.py --send start key:a@0.05,duration=2
+    python spam_key.py --mode click --points grid:100,100,10,5,40,40 --interval 0.02 --glide 0.01 --repeat 0
+    python spam_key.py --mode click --button left --interval 0.01 --when pixel:960,540,#ff0000 --check-rate 120
+    python spam_key.py --mode key --key a --jitter lognormal:0.08,0.3,0.03,0.5 --hold-jitter normal:0.04,0.01 --seed 7
+    python spam_key.py --job key:a@0.1,window_id=0x3a00007 --job key:b@0.2,window_id=0x4c00003   # X11, no focus
 
 - GUI lets you pick key/click mode, interval, duration (0 = until Stop), start delay, hold time, backend, and hotkey.
 - Sends to the active window. Keep the target window focused before the timer ends.
@@ -11,201 +18,3403 @@ Run without arguments to open the GUI (double-click friendly). Example CLI usage
 from __future__ import annotations
 
 import argparse
+import csv
+import heapq
+import importlib
+import importlib.util
+import itertools
+import json
+import math
+import mmap
+import os
+import socket
+import struct
 import sys
+import tempfile
 import threading
 import time
-import tkinter as tk
-from tkinter import messagebox, ttk
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, AsyncIterator, Callable
+
+if TYPE_CHECKING:  # imported where used, to keep CLI startup fast
+    from concurrent.futures import Executor, ThreadPoolExecutor
+
+# Everything below is imported on first use so a CLI run only loads the backend it
+# sends with; tkinter is imported by launch_gui().
+tk = messagebox = ttk = None
+
+
+def _has_module(name: str) -> bool:
+    """Cheap availability check that does not import the module."""
+    return importlib.util.find_spec(name) is not None
+
+
+def _require(name: str, package: str | None = None):
+    """Import an optional dependency on first use; `package` is the pip name if it differs."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise RuntimeError(f"{name} is required. Install with: python -m pip install {package or name}") from None
 
-try:
-    import pyautogui
-except ImportError as exc:  # pragma: no cover - dependency guard
-    sys.exit("pyautogui is required. Install with: python -m pip install pyautogui")
 
 # Optional: pydirectinput can bypass some games that block pyautogui.
-try:  # pragma: no cover - optional dependency
-    import pydirectinput  # type: ignore
-    HAS_PYDIRECT = True
-except ImportError:  # pragma: no cover - optional dependency
-    HAS_PYDIRECT = False
+HAS_PYDIRECT = _has_module("pydirectinput")
+
+# Optional: keyboard allows global hotkeys for start/stop.
+HAS_KEYBOARD = _has_module("keyboard")
+
+# Optional: pygetwindow lets us activate a specific window by title (Windows/macOS/X11).
+HAS_GW = _has_module("pygetwindow")
+
+# Optional: mouse (same author as keyboard) lets --record capture mouse events too.
+HAS_MOUSE = _has_module("mouse")
+
+
+# Sleep through most of a wait and busy-spin only the last stretch. Event.wait/sleep
+# overshoot by up to ~1 ms on Linux/macOS and by a whole timer tick (~15.6 ms) on Windows.
+SPIN_THRESHOLD = 0.016 if sys.platform == "win32" else 0.002
+CATCH_UP_POLICIES = ("skip", "burst")
+
+
+def _wait_until(deadline: float, stop_event: threading.Event | None, spin: float = SPIN_THRESHOLD) -> bool:
+    """Block until the perf_counter() `deadline`. Returns False if stopped first."""
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return not (stop_event and stop_event.is_set())
+        if remaining > spin:
+            if stop_event:
+                if stop_event.wait(remaining - spin):
+                    return False
+            else:
+                time.sleep(remaining - spin)
+        else:
+            if stop_event and stop_event.is_set():
+                return False
+            time.sleep(0)  # yield the GIL while spinning
+
+
+def _wait_with_cancel(seconds: float, stop_event: threading.Event | None) -> None:
+    """Sleep for `seconds` but return as soon as a stop is requested."""
+    if seconds <= 0:
+        return
+    _wait_until(time.perf_counter() + seconds, stop_event)
+
+
+JITTER_BLOCK = 4096  # draws generated per vectorized call
+JITTER_KEEP_BLOCKS = 16  # recent blocks kept for the percentiles in report()
+JITTER_KINDS = ("uniform", "normal", "lognormal")
+
+
+class Jitter:
+    """Random durations from a bounded distribution, drawn by NumPy in blocks.
+
+    "uniform" takes (low, high), "normal" (mean, sd) and "lognormal" (median,
+    sigma), all in seconds; every draw is clipped to [`low`, `high`]. next()
+    hands out values from a block of JITTER_BLOCK draws made in one vectorized
+    call, so a spam loop never calls a random number generator per event. The
+    values handed out are tallied per block for report().
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        a: float,
+        b: float,
+        low: float = 0.0,
+        high: float = math.inf,
+        seed: int | None = None,
+    ) -> None:
+        if kind not in JITTER_KINDS:
+            raise ValueError(f"jitter must be one of {', '.join(JITTER_KINDS)}")
+        if kind == "uniform" and not 0 <= a < b:
+            raise ValueError("uniform jitter needs 0 <= low < high")
+        if kind != "uniform" and b <= 0:
+            raise ValueError(f"{kind} jitter needs a spread > 0")
+        if kind == "lognormal" and a <= 0:
+            raise ValueError("lognormal jitter needs a median > 0")
+        if not 0 <= low < high:
+            raise ValueError("jitter bounds need 0 <= low < high")
+        np = _require("numpy")
+        self._np = np
+        self._rng = np.random.default_rng(seed)
+        self.kind, self.a, self.b, self.low, self.high = kind, a, b, low, high
+        self.count = 0
+        self._sum = self._sumsq = 0.0
+        self._min, self._max = math.inf, 0.0
+        self._recent: deque = deque(maxlen=JITTER_KEEP_BLOCKS)
+        self._draw()
+        self.mean = float(self._array.mean())  # nominal period for catch-up and rate checks
+
+    def _draw(self) -> None:
+        np, rng, n = self._np, self._rng, JITTER_BLOCK
+        if self.kind == "uniform":
+            block = rng.uniform(self.a, self.b, n)
+        elif self.kind == "normal":
+            block = rng.normal(self.a, self.b, n)
+        else:
+            block = rng.lognormal(math.log(self.a), self.b, n)
+        np.clip(block, self.low, self.high, out=block)
+        self._array = block
+        self._block = block.tolist()
+        self._index = 0
+        self._tallied = 0  # draws of this block already counted by _tally
+
+    def _tally(self, used) -> None:
+        if len(used):
+            self.count += len(used)
+            self._sum += float(used.sum())
+            self._sumsq += float((used * used).sum())
+            self._min = min(self._min, float(used.min()))
+            self._max = max(self._max, float(used.max()))
+            self._recent.append(used)
+
+    def _tally_used(self) -> None:
+        self._tally(self._array[self._tallied : self._index])
+        self._tallied = self._index
+
+    def next(self) -> float:
+        i = self._index
+        if i == JITTER_BLOCK:
+            self._tally_used()
+            self._draw()
+            i = 0
+        self._index = i + 1
+        return self._block[i]
+
+    def scale(self, factor: float) -> None:
+        """Stretch the distribution (bounds included) by `factor`, e.g. to clamp its mean rate."""
+        if factor == 1:
+            return
+        self._tally_used()
+        self.a *= factor
+        if self.kind != "lognormal":  # lognormal sigma is a shape, not a duration
+            self.b *= factor
+        self.low *= factor
+        self.high *= factor
+        self._draw()
+        self.mean *= factor
+
+    def report(self) -> dict:
+        """Distribution of the values handed out so far (percentiles over the recent blocks)."""
+        np = self._np
+        self._tally_used()
+        if not self.count:
+            return {"kind": self.kind, "count": 0}
+        mean = self._sum / self.count
+        recent = np.concatenate(list(self._recent))
+        p5, p50, p95 = (float(v) for v in np.percentile(recent, (5, 50, 95)))
+        return {
+            "kind": self.kind,
+            "count": self.count,
+            "mean_ms": mean * 1000,
+            "sd_ms": math.sqrt(max(0.0, self._sumsq / self.count - mean * mean)) * 1000,
+            "min_ms": self._min * 1000,
+            "p5_ms": p5 * 1000,
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "max_ms": self._max * 1000,
+        }
+
+
+def parse_jitter(spec: str, seed: int | None = None) -> Jitter:
+    """Build a Jitter from ``KIND:A,B[,LOW,HIGH]`` in seconds, e.g. ``normal:0.05,0.01,0.02,0.1``."""
+    kind, _, body = spec.partition(":")
+    try:
+        values = [float(v) for v in body.split(",")]
+        if len(values) not in (2, 4):
+            raise ValueError
+    except ValueError:
+        raise ValueError(
+            f"Invalid jitter '{spec}'. Use uniform:LOW,HIGH, normal:MEAN,SD or lognormal:MEDIAN,SIGMA, "
+            "optionally followed by ,MIN,MAX bounds."
+        ) from None
+    a, b, *bounds = values
+    low, high = bounds if bounds else (a, b) if kind == "uniform" else (0.0, math.inf)
+    return Jitter(kind, a, b, low, high, seed)
+
+
+def format_jitter(name: str, report: dict) -> str:
+    if not report["count"]:
+        return f"{name} ({report['kind']}): no draws used"
+    return (
+        f"{name} ({report['kind']}): {report['count']} draws, mean {report['mean_ms']:.2f} ms, "
+        f"sd {report['sd_ms']:.2f} ms, min {report['min_ms']:.2f}, p5 {report['p5_ms']:.2f}, "
+        f"p50 {report['p50_ms']:.2f}, p95 {report['p95_ms']:.2f}, max {report['max_ms']:.2f} ms"
+    )
+
+
+class DeadlineScheduler:
+    """Fire ticks on an absolute grid: tick n is due at ``start + n * period``.
+
+    Deadlines never depend on how long the previous action took, so backend call
+    time does not accumulate into drift. When the caller falls more than a period
+    behind, ``catch_up`` decides what happens: "skip" drops the missed ticks and
+    resumes on the grid, "burst" fires them back to back until caught up.
+
+    With `jitter`, tick n+1 is due a fresh draw after tick n instead. Deadlines
+    are still chained from deadlines, not from when actions ran, so lateness
+    does not accumulate; the jitter's mean then stands in for `period`.
+    """
+
+    def __init__(
+        self,
+        period: float,
+        end_at: float | None = None,
+        catch_up: str = "skip",
+        start: float | None = None,
+        jitter: Jitter | None = None,
+    ) -> None:
+        if period <= 0:
+            raise ValueError("period must be > 0")
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {', '.join(CATCH_UP_POLICIES)}")
+        self.jitter = jitter
+        self.period = jitter.mean if jitter else period
+        self.start = time.perf_counter() if start is None else start
+        self.end_at = end_at
+        self.catch_up = catch_up
+        self.ticks = 0
+        self.skipped = 0
+        self.deadline = self.start
+
+    def next_deadline(self) -> float | None:
+        """Advance to the next tick and return its due time, or None once past `end_at`."""
+        if self.jitter:
+            return self._next_jittered()
+        self.deadline = self.start + (self.ticks + self.skipped) * self.period
+        if self.ticks and self.catch_up == "skip":
+            late = time.perf_counter() - self.deadline
+            if late > self.period:
+                missed = int(late // self.period)
+                self.skipped += missed
+                self.deadline += missed * self.period
+        if self.end_at is not None and self.deadline >= self.end_at:
+            return None
+        self.ticks += 1
+        return self.deadline
+
+    def _next_jittered(self) -> float | None:
+        if self.ticks:
+            self.deadline += self.jitter.next()
+            if self.catch_up == "skip":
+                now = time.perf_counter()
+                while now - self.deadline > self.period:
+                    self.deadline += self.jitter.next()
+                    self.skipped += 1
+        if self.end_at is not None and self.deadline >= self.end_at:
+            return None
+        self.ticks += 1
+        return self.deadline
+
+    def wait(self, stop_event: threading.Event | None = None) -> bool:
+        """Block until the next tick is due. Returns False once stopped or past `end_at`."""
+        deadline = self.next_deadline()
+        return deadline is not None and _wait_until(deadline, stop_event)
+
+
+class Backend:
+    """Input sender used by the spam loops. Subclasses wrap one input library."""
+
+    name = "base"
+    hooked = False  # output is seen by the keyboard module's global hook, so it notes keys in INJECTED
+    needs_arg = False  # only usable as "name:arg" (e.g. xsend needs a window id)
+    can_scroll = False  # implements scroll(); recordings skip wheel events otherwise
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def key_down(self, key: str) -> None:
+        raise NotImplementedError
+
+    def key_up(self, key: str) -> None:
+        raise NotImplementedError
+
+    def press(self, key: str) -> None:
+        raise NotImplementedError
+
+    def mouse_down(self, button: str) -> None:
+        raise NotImplementedError
+
+    def mouse_up(self, button: str) -> None:
+        raise NotImplementedError
+
+    def click(self, button: str) -> None:
+        raise NotImplementedError
+
+    def move_to(self, x: int, y: int) -> None:
+        raise NotImplementedError
+
+    def scroll(self, clicks: int) -> None:
+        """Turn the wheel; only called on backends with `can_scroll`."""
+        raise NotImplementedError
+
+    def press_many(self, key: str, count: int) -> None:
+        """Send `count` taps back to back; backends override this to batch them in one call."""
+        for _ in range(count):
+            self.press(key)
+
+    def click_many(self, button: str, count: int) -> None:
+        for _ in range(count):
+            self.click(button)
+
+    def click_at(self, x: int, y: int, button: str) -> None:
+        """Move to (x, y) and click there; backends override this to do both in one call."""
+        self.move_to(x, y)
+        self.click(button)
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+# Spellings of the same key across pyautogui, pydirectinput, hotkey strings,
+# recordings and keyboard events, mapped to one canonical name (see _key_alias).
+# Canonical names are valid pyautogui keys and the keys of _X_KEYSYMS.
+_KEY_ALIASES = {
+    "\n": "enter",
+    "\r": "enter",
+    "return": "enter",
+    "\t": "tab",
+    " ": "space",
+    "escape": "esc",
+    "del": "delete",
+    "pgup": "pageup",
+    "page up": "pageup",
+    "pgdn": "pagedown",
+    "page down": "pagedown",
+    "win": "winleft",
+    "windows": "winleft",
+    "left windows": "winleft",
+    "right windows": "winright",
+    "shiftleft": "shift",
+    "left shift": "shift",
+    "right shift": "shiftright",
+    "ctrlleft": "ctrl",
+    "left ctrl": "ctrl",
+    "right ctrl": "ctrlright",
+    "altleft": "alt",
+    "left alt": "alt",
+    "right alt": "altright",
+    "alt gr": "altright",
+    "caps lock": "capslock",
+    "num lock": "numlock",
+    "scroll lock": "scrolllock",
+    "print screen": "printscreen",
+    "prtsc": "printscreen",
+    "prtscr": "printscreen",
+    "prntscrn": "printscreen",
+}
+
+
+# Right-hand modifiers also count as the generic one in hotkeys ("ctrl+k" fires
+# with either Ctrl), as keyboard.add_hotkey did.
+_HOTKEY_SIDES = {"shiftright": "shift", "ctrlright": "ctrl", "altright": "alt", "winright": "winleft"}
+
+
+def _key_alias(name: str) -> str:
+    """Canonical spelling of a key name given to a backend, in a hotkey or by a keyboard event."""
+    name = name.lower()
+    if name in _KEY_ALIASES:  # before stripping: " " and "\n" are keys too
+        return _KEY_ALIASES[name]
+    name = name.strip()
+    return _KEY_ALIASES.get(name, name)
+
+
+class InjectionTracker:
+    """Count key events this process is injecting so a global hook can drop them in O(1).
+
+    Backends whose output reaches system-wide hooks (Backend.hooked) call note()
+    just before sending; the hook calls consume() for each event it sees, and a
+    match means the event is ours. Each note expires TTL seconds after it was
+    made whether or not later ones follow, so events the hook never saw (a
+    blocked or remapped key) cannot pile up and swallow the user's own presses.
+    Disabled (note() is a no-op) until a hook turns it on.
+    """
+
+    TTL = 0.5
+    MAX_NOTES = 4096  # per key and direction; older notes are dropped first
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, bool], deque] = {}  # (key, down) -> [expires, count] per note
+
+    def note(self, key: str, down: bool, count: int = 1) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        slot = (_key_alias(key), down)
+        with self._lock:
+            notes = self._pending.get(slot)
+            if notes is None:
+                notes = self._pending[slot] = deque(maxlen=self.MAX_NOTES)
+            while notes and notes[0][0] < now:
+                notes.popleft()
+            notes.append([now + self.TTL, count])
+
+    def note_taps(self, key: str, count: int = 1) -> None:
+        if self.enabled:
+            self.note(key, True, count)
+            self.note(key, False, count)
+
+    def consume(self, key: str, down: bool) -> bool:
+        """True if this event (`key` as given by _key_alias) is one we injected, and count it off."""
+        with self._lock:
+            notes = self._pending.get((key, down))
+            if not notes:
+                return False
+            now = time.perf_counter()
+            while notes and notes[0][0] < now:
+                notes.popleft()
+            if not notes:
+                return False
+            oldest = notes[0]
+            oldest[1] -= 1
+            if not oldest[1]:
+                notes.popleft()
+            return True
+
+
+INJECTED = InjectionTracker()
+
+BACKENDS: dict[str, type[Backend]] = {}
+
+
+def _release_backend(sender: Backend, backend: str | Backend) -> None:
+    """Close `sender` if it was built from a name; caller-supplied instances stay open."""
+    if sender is not backend:
+        sender.close()
+
+
+def chord_keys(key: str) -> tuple[str, ...]:
+    """Split a chord such as "ctrl+shift+t" into its keys; a lone "+" stays one key."""
+    parts = key.split("+")
+    return tuple(parts) if len(parts) > 1 and all(parts) else (key,)
+
+
+def register_backend(cls: type[Backend]) -> type[Backend]:
+    """Class decorator adding a backend to the registry under `cls.name`."""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def available_backends() -> list[str]:
+    """Backends usable here by name alone (the GUI list and --calibrate)."""
+    return [name for name, cls in BACKENDS.items() if cls.available() and not cls.needs_arg]
+
+
+def get_backend(backend: str | Backend) -> Backend:
+    """Return `backend` itself if it is an instance, otherwise build the registered one.
+
+    "name:arg" passes `arg` to the backend, e.g. "xsend:0x3a00007" or "xtest::99".
+    """
+    if isinstance(backend, Backend):
+        return backend
+    name, _, arg = backend.partition(":")
+    cls = BACKENDS.get(name)
+    if cls is None:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    return cls(arg) if arg else cls()
+
+
+@register_backend
+class PyAutoGUIBackend(Backend):
+    name = "pyautogui"
+    can_scroll = True
+    hooked = not sys.platform.startswith("linux")  # on X11 it sends through XTest, which `keyboard` never sees
+
+    @classmethod
+    def available(cls) -> bool:
+        return _has_module("pyautogui")
+
+    def __init__(self) -> None:
+        self._gui = _require("pyautogui")
+        self._gui.FAILSAFE = False
+        self._gui.PAUSE = 0  # run as fast as the interval allows
+
+    def key_down(self, key: str) -> None:
+        if self.hooked:
+            INJECTED.note(key, True)
+        self._gui.keyDown(key)
+
+    def key_up(self, key: str) -> None:
+        if self.hooked:
+            INJECTED.note(key, False)
+        self._gui.keyUp(key)
+
+    def press(self, key: str) -> None:
+        if self.hooked:
+            INJECTED.note_taps(key)
+        self._gui.press(key)
+
+    def mouse_down(self, button: str) -> None:
+        self._gui.mouseDown(button=button)
+
+    def mouse_up(self, button: str) -> None:
+        self._gui.mouseUp(button=button)
+
+    def click(self, button: str) -> None:
+        self._gui.click(button=button)
+
+    def move_to(self, x: int, y: int) -> None:
+        self._gui.moveTo(x, y)
+
+    def click_at(self, x: int, y: int, button: str) -> None:
+        self._gui.click(x, y, button=button)
+
+    def scroll(self, clicks: int) -> None:
+        self._gui.scroll(clicks)
+
+    def press_many(self, key: str, count: int) -> None:
+        if self.hooked:
+            INJECTED.note_taps(key, count)
+        self._gui.press(key, presses=count)
+
+    def click_many(self, button: str, count: int) -> None:
+        self._gui.click(button=button, clicks=count)
+
+
+@register_backend
+class PyDirectInputBackend(Backend):
+    name = "pydirectinput"
+    hooked = True
+
+    @classmethod
+    def available(cls) -> bool:
+        return HAS_PYDIRECT
+
+    def __init__(self) -> None:
+        if not HAS_PYDIRECT:
+            raise RuntimeError("pydirectinput is not installed. Install with: python -m pip install pydirectinput")
+        self._direct = _require("pydirectinput")
+
+    def key_down(self, key: str) -> None:
+        INJECTED.note(key, True)
+        self._direct.keyDown(key)
+
+    def key_up(self, key: str) -> None:
+        INJECTED.note(key, False)
+        self._direct.keyUp(key)
+
+    def press(self, key: str) -> None:
+        INJECTED.note_taps(key)
+        self._direct.press(key)
+
+    def mouse_down(self, button: str) -> None:
+        self._direct.mouseDown(button=button)
+
+    def mouse_up(self, button: str) -> None:
+        self._direct.mouseUp(button=button)
+
+    def click(self, button: str) -> None:
+        self._direct.click(button=button)
+
+    def move_to(self, x: int, y: int) -> None:
+        self._direct.moveTo(x, y)
+
+    def click_at(self, x: int, y: int, button: str) -> None:
+        self._direct.click(x, y, button=button)
+
+    def press_many(self, key: str, count: int) -> None:
+        INJECTED.note_taps(key, count)
+        self._direct.press(key, presses=count)
+
+    def click_many(self, button: str, count: int) -> None:
+        self._direct.click(button=button, clicks=count)
+
+
+# Canonical key names (see _key_alias) -> X keysym names; single characters map straight to keysyms.
+_X_KEYSYMS = {
+    "space": "space",
+    "enter": "Return",
+    "esc": "Escape",
+    "tab": "Tab",
+    "backspace": "BackSpace",
+    "delete": "Delete",
+    "insert": "Insert",
+    "home": "Home",
+    "end": "End",
+    "pageup": "Prior",
+    "pagedown": "Next",
+    "up": "Up",
+    "down": "Down",
+    "left": "Left",
+    "right": "Right",
+    "shift": "Shift_L",
+    "shiftright": "Shift_R",
+    "ctrl": "Control_L",
+    "ctrlright": "Control_R",
+    "alt": "Alt_L",
+    "altright": "Alt_R",
+    "winleft": "Super_L",
+    "winright": "Super_R",
+    "capslock": "Caps_Lock",
+    "numlock": "Num_Lock",
+    "scrolllock": "Scroll_Lock",
+    "printscreen": "Print",
+    "pause": "Pause",
+}
+_X_BUTTONS = {"left": 1, "middle": 2, "right": 3, "4": 4, "5": 5}  # 4/5 = wheel up/down
+_x11 = None
+
+
+def _load_x11():
+    """Load libX11 and libXtst through ctypes once and declare the calls we use."""
+    global _x11
+    if _x11 is not None:
+        return _x11
+    import ctypes
+    import ctypes.util
+
+    paths = [ctypes.util.find_library(name) for name in ("X11", "Xtst")]
+    if not all(paths):
+        raise RuntimeError("libX11 and libXtst are required for the X11 backends (e.g. apt install libx11-6 libxtst6).")
+    xlib, xtst = (ctypes.CDLL(path) for path in paths)
+    display_p, ulong, uint, cint = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_uint, ctypes.c_int
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XOpenDisplay.restype = display_p
+    xlib.XCloseDisplay.argtypes = [display_p]
+    xlib.XFlush.argtypes = [display_p]
+    xlib.XStringToKeysym.argtypes = [ctypes.c_char_p]
+    xlib.XStringToKeysym.restype = ulong
+    xlib.XKeysymToKeycode.argtypes = [display_p, ulong]
+    xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+    xlib.XKeycodeToKeysym.argtypes = [display_p, ctypes.c_ubyte, cint]
+    xlib.XKeycodeToKeysym.restype = ulong
+    xtst.XTestQueryExtension.argtypes = [display_p] + [ctypes.POINTER(cint)] * 4
+    xtst.XTestFakeKeyEvent.argtypes = [display_p, uint, cint, ulong]
+    xtst.XTestFakeButtonEvent.argtypes = [display_p, uint, cint, ulong]
+    xtst.XTestFakeMotionEvent.argtypes = [display_p, cint, cint, cint, ulong]
+    xlib.XDefaultRootWindow.argtypes = [display_p]
+    xlib.XDefaultRootWindow.restype = ulong
+    xlib.XGetGeometry.argtypes = [display_p, ulong, ctypes.POINTER(ulong)] + [ctypes.POINTER(cint)] * 2 + [
+        ctypes.POINTER(uint)
+    ] * 4
+    xlib.XSendEvent.argtypes = [display_p, ulong, cint, ctypes.c_long, ctypes.c_void_p]
+    xlib.XSync.argtypes = [display_p, cint]
+
+    class XKeyButtonEvent(ctypes.Structure):
+        # XKeyEvent and XButtonEvent share this layout; `detail` is the keycode or button.
+        _fields_ = [
+            ("type", cint),
+            ("serial", ulong),
+            ("send_event", cint),
+            ("display", display_p),
+            ("window", ulong),
+            ("root", ulong),
+            ("subwindow", ulong),
+            ("time", ulong),
+            ("x", cint),
+            ("y", cint),
+            ("x_root", cint),
+            ("y_root", cint),
+            ("state", uint),
+            ("detail", uint),
+            ("same_screen", cint),
+        ]
+
+    class XEvent(ctypes.Union):
+        _fields_ = [("event", XKeyButtonEvent), ("pad", ctypes.c_long * 24)]
+
+    # Xlib's default error handler exits the process; log-and-continue instead so a
+    # closed target window cannot take the spammer down with it.
+    @ctypes.CFUNCTYPE(cint, display_p, ctypes.c_void_p)
+    def on_error(display, event):
+        print("X11 error while sending input (target window closed?)", file=sys.stderr)
+        return 0
+
+    xlib.XSetErrorHandler(on_error)
+    xlib.XEvent = XEvent
+    xlib.on_error = on_error  # keep the callback alive as long as the library
+    _x11 = (ctypes, xlib, xtst)
+    return _x11
+
+
+def _x_keysym(xlib, key: str) -> int:
+    name = _X_KEYSYMS.get(_key_alias(key) if len(key) > 1 else _KEY_ALIASES.get(key, key))
+    if name is None and len(key) > 1 and key[0] in "fF" and key[1:].isdigit():
+        name = key.upper()
+    if name is not None:
+        return xlib.XStringToKeysym(name.encode("ascii"))
+    if len(key) == 1:
+        code = ord(key)
+        return code if 0x20 <= code <= 0xFF else 0x01000000 | code  # Latin-1 keysyms equal code points
+    return xlib.XStringToKeysym(key.encode("utf-8"))
+
+
+class _X11Backend(Backend):
+    """Display connection and key resolution shared by the X11 backends.
+
+    One connection is opened per backend (i.e. per run) and each key name is
+    resolved once to its keycode and whether it sits on the shifted level of
+    that keycode ("A", "!"), so sending it needs Shift.
+    """
+
+    can_scroll = True  # wheel buttons 4 and 5
+
+    @classmethod
+    def available(cls) -> bool:
+        return sys.platform.startswith("linux") and bool(os.environ.get("DISPLAY"))
+
+    def __init__(self, display: str | None = None) -> None:
+        self._ctypes, self._xlib, self._xtst = _load_x11()
+        self._display = self._xlib.XOpenDisplay(display.encode() if display else None)
+        if not self._display:
+            raise RuntimeError(f"Cannot open X display {display or os.environ.get('DISPLAY', '(DISPLAY not set)')}.")
+        self._keys: dict[str, tuple[int, bool]] = {}
+
+    def resolve(self, key: str) -> tuple[int, bool]:
+        """(keycode, needs Shift) for `key`."""
+        resolved = self._keys.get(key)
+        if resolved is None:
+            keysym = _x_keysym(self._xlib, key)
+            code = self._xlib.XKeysymToKeycode(self._display, keysym) if keysym else 0
+            if not code:
+                raise ValueError(f"Key '{key}' has no keycode on this X server.")
+            to_keysym = self._xlib.XKeycodeToKeysym
+            shifted = to_keysym(self._display, code, 0) != keysym and to_keysym(self._display, code, 1) == keysym
+            resolved = self._keys[key] = (code, shifted)
+        return resolved
+
+    def keycode(self, key: str) -> int:
+        return self.resolve(key)[0]
+
+    def close(self) -> None:
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+@register_backend
+class XTestBackend(_X11Backend):
+    """Linux/X11 backend that calls the XTest extension directly.
+
+    Each event is a single Xlib call, with Shift_L pressed around keys on the
+    shifted level as pyautogui does. Every public call flushes once; press_many
+    queues a whole batch before flushing.
+    """
+
+    name = "xtest"
+
+    def __init__(self, display: str | None = None) -> None:
+        super().__init__(display)
+        dummy = self._ctypes.c_int()
+        if not self._xtst.XTestQueryExtension(self._display, *(self._ctypes.byref(dummy) for _ in range(4))):
+            self.close()
+            raise RuntimeError("The X server does not support the XTEST extension.")
+        self._shift = self.keycode("shift")
+
+    def _button(self, button: str) -> int:
+        try:
+            return _X_BUTTONS[button]
+        except KeyError:
+            raise ValueError(f"Unknown mouse button '{button}'. Use left, middle or right.") from None
+
+    def key_down(self, key: str) -> None:
+        code, shifted = self.resolve(key)
+        if shifted:
+            self._xtst.XTestFakeKeyEvent(self._display, self._shift, 1, 0)
+        self._xtst.XTestFakeKeyEvent(self._display, code, 1, 0)
+        self._xlib.XFlush(self._display)
+
+    def key_up(self, key: str) -> None:
+        code, shifted = self.resolve(key)
+        self._xtst.XTestFakeKeyEvent(self._display, code, 0, 0)
+        if shifted:
+            self._xtst.XTestFakeKeyEvent(self._display, self._shift, 0, 0)
+        self._xlib.XFlush(self._display)
+
+    def press(self, key: str) -> None:
+        self.press_many(key, 1)
+
+    def press_many(self, key: str, count: int) -> None:
+        (code, shifted), fake, display = self.resolve(key), self._xtst.XTestFakeKeyEvent, self._display
+        if shifted:
+            fake(display, self._shift, 1, 0)
+        for _ in range(count):
+            fake(display, code, 1, 0)
+            fake(display, code, 0, 0)
+        if shifted:
+            fake(display, self._shift, 0, 0)
+        self._xlib.XFlush(display)
+
+    def mouse_down(self, button: str) -> None:
+        self._xtst.XTestFakeButtonEvent(self._display, self._button(button), 1, 0)
+        self._xlib.XFlush(self._display)
+
+    def mouse_up(self, button: str) -> None:
+        self._xtst.XTestFakeButtonEvent(self._display, self._button(button), 0, 0)
+        self._xlib.XFlush(self._display)
+
+    def click(self, button: str) -> None:
+        self.click_many(button, 1)
+
+    def click_many(self, button: str, count: int) -> None:
+        code, fake, display = self._button(button), self._xtst.XTestFakeButtonEvent, self._display
+        for _ in range(count):
+            fake(display, code, 1, 0)
+            fake(display, code, 0, 0)
+        self._xlib.XFlush(display)
+
+    def move_to(self, x: int, y: int) -> None:
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+        self._xlib.XFlush(self._display)
+
+    def click_at(self, x: int, y: int, button: str) -> None:
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+        self.click_many(button, 1)  # one flush for the move and the click
+
+    def scroll(self, clicks: int) -> None:
+        self.click_many("4" if clicks > 0 else "5", abs(clicks))
+
+
+# X protocol constants for XSendEvent.
+X_KEY_PRESS, X_KEY_RELEASE, X_BUTTON_PRESS, X_BUTTON_RELEASE = 2, 3, 4, 5
+X_EVENT_MASKS = {X_KEY_PRESS: 1 << 0, X_KEY_RELEASE: 1 << 1, X_BUTTON_PRESS: 1 << 2, X_BUTTON_RELEASE: 1 << 3}
+X_SHIFT_MASK = 1
+
+
+@register_backend
+class XSendEventBackend(_X11Backend):
+    """Deliver synthetic X11 events straight to one window without focusing it.
+
+    Build with the window id ("xsend:0x3a00007", see `xwininfo` or `xdotool`).
+    Each instance has its own display connection, so one process can drive many
+    windows from separate jobs. Events carry the send_event flag, and some
+    applications (xterm by default) ignore such events.
+    """
+
+    name = "xsend"
+    needs_arg = True
+
+    def __init__(self, window: str | int | None = None, display: str | None = None) -> None:
+        if window is None:
+            raise ValueError("The xsend backend needs a window id, e.g. --window-id 0x3a00007.")
+        try:
+            self.window = int(window, 0) if isinstance(window, str) else window
+        except ValueError:
+            raise ValueError(f"Invalid X window id '{window}'. Use a number such as 0x3a00007.") from None
+        super().__init__(display)
+        ulong, cint, uint = self._ctypes.c_ulong, self._ctypes.c_int, self._ctypes.c_uint
+        root, ints, uints = ulong(), [cint() for _ in range(2)], [uint() for _ in range(4)]
+        args = [self._ctypes.byref(v) for v in (root, *ints, *uints)]
+        if not self._xlib.XGetGeometry(self._display, self.window, *args):
+            self.close()
+            raise RuntimeError(f"No X window with id {self.window:#x}.")
+        self._event = self._xlib.XEvent()
+        fields = self._event.event
+        fields.display = self._display
+        fields.window = self.window
+        fields.root = self._xlib.XDefaultRootWindow(self._display)
+        fields.same_screen = 1
+
+    def _send(self, kind: int, detail: int, state: int = 0) -> None:
+        fields = self._event.event
+        fields.type = kind
+        fields.detail = detail
+        fields.state = state
+        self._xlib.XSendEvent(self._display, self.window, 1, X_EVENT_MASKS[kind], self._ctypes.byref(self._event))
+
+    def _key(self, key: str, kinds: tuple[int, ...], count: int = 1) -> None:
+        code, shifted = self.resolve(key)
+        state = X_SHIFT_MASK if shifted else 0
+        for _ in range(count):
+            for kind in kinds:
+                self._send(kind, code, state)
+        self._xlib.XFlush(self._display)
+
+    def _button(self, button: str, kinds: tuple[int, ...], count: int = 1) -> None:
+        try:
+            code = _X_BUTTONS[button]
+        except KeyError:
+            raise ValueError(f"Unknown mouse button '{button}'. Use left, middle or right.") from None
+        for _ in range(count):
+            for kind in kinds:
+                self._send(kind, code)
+        self._xlib.XFlush(self._display)
+
+    def key_down(self, key: str) -> None:
+        self._key(key, (X_KEY_PRESS,))
+
+    def key_up(self, key: str) -> None:
+        self._key(key, (X_KEY_RELEASE,))
+
+    def press(self, key: str) -> None:
+        self._key(key, (X_KEY_PRESS, X_KEY_RELEASE))
+
+    def press_many(self, key: str, count: int) -> None:
+        self._key(key, (X_KEY_PRESS, X_KEY_RELEASE), count)
+
+    def mouse_down(self, button: str) -> None:
+        self._button(button, (X_BUTTON_PRESS,))
+
+    def mouse_up(self, button: str) -> None:
+        self._button(button, (X_BUTTON_RELEASE,))
+
+    def click(self, button: str) -> None:
+        self._button(button, (X_BUTTON_PRESS, X_BUTTON_RELEASE))
+
+    def click_many(self, button: str, count: int) -> None:
+        self._button(button, (X_BUTTON_PRESS, X_BUTTON_RELEASE), count)
+
+    def move_to(self, x: int, y: int) -> None:
+        """Set the window-relative position later button events report; the pointer does not move."""
+        fields = self._event.event
+        fields.x, fields.y = x, y
+
+    def scroll(self, clicks: int) -> None:
+        self.click_many("4" if clicks > 0 else "5", abs(clicks))
+
+
+@register_backend
+class NullBackend(Backend):
+    """Headless backend that records (perf_counter time, op, arg) instead of sending input."""
+
+    name = "null"
+    can_scroll = True
+
+    def __init__(self) -> None:
+        self.events: list[tuple[float, str, str]] = []
+
+    def _record(self, op: str, arg: str) -> None:
+        self.events.append((time.perf_counter(), op, arg))
+
+    def key_down(self, key: str) -> None:
+        self._record("key_down", key)
+
+    def key_up(self, key: str) -> None:
+        self._record("key_up", key)
+
+    def press(self, key: str) -> None:
+        self._record("press", key)
+
+    def mouse_down(self, button: str) -> None:
+        self._record("mouse_down", button)
+
+    def mouse_up(self, button: str) -> None:
+        self._record("mouse_up", button)
+
+    def click(self, button: str) -> None:
+        self._record("click", button)
+
+    def move_to(self, x: int, y: int) -> None:
+        self._record("move_to", f"{x},{y}")
+
+    def click_at(self, x: int, y: int, button: str) -> None:
+        self._record("click_at", f"{x},{y},{button}")
+
+    def scroll(self, clicks: int) -> None:
+        self._record("scroll", str(clicks))
+
+    def press_many(self, key: str, count: int) -> None:
+        now = time.perf_counter()
+        self.events.extend([(now, "press", key)] * count)
+
+    def click_many(self, button: str, count: int) -> None:
+        now = time.perf_counter()
+        self.events.extend([(now, "click", button)] * count)
+
+
+class LatencyHistogram:
+    """Fixed log-scale histogram of durations: 4 buckets per octave from 1 µs to ~30 s."""
+
+    BUCKETS = 100
+
+    def __init__(self) -> None:
+        self.counts = array("Q", bytes(8 * (self.BUCKETS + 1)))
+        self.total = 0
+
+    def add(self, seconds: float) -> None:
+        if seconds <= 1e-6:
+            index = 0
+        else:
+            index = min(self.BUCKETS, int(math.log2(seconds * 1e6) * 4) + 1)
+        self.counts[index] += 1
+        self.total += 1
+
+    @classmethod
+    def upper_edge(cls, index: int) -> float:
+        return 1e-6 * 2 ** (index / 4)
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket edge below which `q` percent of samples fall (0.0 when empty)."""
+        if not self.total:
+            return 0.0
+        threshold = q / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return self.upper_edge(index)
+        return self.upper_edge(self.BUCKETS)
+
+    def buckets(self) -> list[tuple[float, int]]:
+        return [(self.upper_edge(i), c) for i, c in enumerate(self.counts) if c]
+
+
+class TimingRecorder:
+    """Opt-in per-action timing with bounded memory.
+
+    The last `capacity` actions are kept in ring buffers (scheduled time, send time,
+    backend call duration, hold error) and every action also lands in fixed
+    histograms, so a duration=0 run never grows. Written by one worker thread;
+    readers such as the GUI only sample it.
+    """
+
+    FIELDS = ("scheduled", "sent", "call", "hold_error")
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.scheduled = array("d", bytes(8 * capacity))
+        self.sent = array("d", bytes(8 * capacity))
+        self.call = array("d", bytes(8 * capacity))
+        self.hold_error = array("d", bytes(8 * capacity))
+        self.lateness = LatencyHistogram()
+        self.call_time = LatencyHistogram()
+        self.count = 0
+        self.actions = 0
+        self.first_sent = 0.0
+        self.last_sent = 0.0
+
+    def record(self, scheduled: float, sent: float, call: float, hold_error: float = 0.0, actions: int = 1) -> None:
+        """Record one backend call; `actions` > 1 for a burst-mode batch."""
+        i = self.count % self.capacity
+        self.scheduled[i] = scheduled
+        self.sent[i] = sent
+        self.call[i] = call
+        self.hold_error[i] = hold_error
+        self.lateness.add(sent - scheduled)
+        self.call_time.add(call)
+        if not self.count:
+            self.first_sent = sent
+        self.last_sent = sent
+        self.count += 1
+        self.actions += actions
+
+    def rows(self) -> list[tuple[float, float, float, float]]:
+        """Buffered actions, oldest first."""
+        n = min(self.count, self.capacity)
+        start = self.count - n
+        return [
+            (self.scheduled[i], self.sent[i], self.call[i], self.hold_error[i])
+            for i in (j % self.capacity for j in range(start, self.count))
+        ]
+
+    def summary(self) -> dict[str, float]:
+        elapsed = self.last_sent - self.first_sent
+        holds = [abs(h) for h in self.hold_error[: min(self.count, self.capacity)]]
+        return {
+            "actions": self.actions,
+            "calls": self.count,
+            "rate": (self.count - 1) * self.actions / self.count / elapsed if elapsed > 0 else 0.0,
+            "lateness_p50_ms": self.lateness.percentile(50) * 1000,
+            "lateness_p99_ms": self.lateness.percentile(99) * 1000,
+            "lateness_max_ms": self.lateness.percentile(100) * 1000,
+            "call_p50_ms": self.call_time.percentile(50) * 1000,
+            "call_p99_ms": self.call_time.percentile(99) * 1000,
+            "hold_error_mean_ms": sum(holds) / len(holds) * 1000 if holds else 0.0,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "summary": self.summary(),
+            "lateness_histogram": self.lateness.buckets(),
+            "call_histogram": self.call_time.buckets(),
+            "fields": list(self.FIELDS),
+            "recent": self.rows(),
+        }
+
+
+def export_stats(path: str, recorders: dict[str, TimingRecorder]) -> None:
+    """Write recorders to `path`: CSV rows (one per buffered action) for .csv, JSON otherwise."""
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        if path.lower().endswith(".csv"):
+            writer = csv.writer(fh)
+            writer.writerow(("run",) + TimingRecorder.FIELDS)
+            for name, recorder in recorders.items():
+                writer.writerows((name,) + row for row in recorder.rows())
+        else:
+            json.dump({name: recorder.to_dict() for name, recorder in recorders.items()}, fh, indent=2)
+
+
+def format_timing(recorder: TimingRecorder) -> str:
+    s = recorder.summary()
+    return (
+        f"{s['rate']:.1f}/s, lateness p50 {s['lateness_p50_ms']:.3f} ms p99 {s['lateness_p99_ms']:.3f} ms, "
+        f"backend call p99 {s['call_p99_ms']:.3f} ms"
+    )
+
+
+def _validate_run(
+    interval: float | None,
+    duration: float,
+    start_delay: float,
+    hold: float,
+    catch_up: str,
+    target_window: str | None,
+    batch: int = 1,
+) -> None:
+    """Checks shared by every run mode. `interval` is None for modes without one."""
+    if interval is not None and interval <= 0:
+        raise ValueError("interval must be > 0")
+    if duration < 0:
+        raise ValueError("duration must be >= 0")
+    if start_delay < 0:
+        raise ValueError("start_delay must be >= 0")
+    if hold < 0:
+        raise ValueError("hold must be >= 0")
+    if catch_up not in CATCH_UP_POLICIES:
+        raise ValueError(f"catch_up must be one of {', '.join(CATCH_UP_POLICIES)}")
+    if batch < 1:
+        raise ValueError("batch must be >= 1")
+    if batch > 1 and hold > 0:
+        raise ValueError("batch > 1 only works with taps (hold = 0)")
+    if target_window and not HAS_GW:
+        raise RuntimeError("pygetwindow is required for target window. Install with: python -m pip install pygetwindow")
+
+
+# Burst mode keeps scheduler wakeups at or below this rate and sends the rest as batches.
+MAX_WAKEUPS_PER_SEC = 500
+
+
+def parse_rate(text: str) -> float:
+    """Parse '2000', '2000/s' or '90/min' into actions per second."""
+    number, _, unit = text.strip().partition("/")
+    per = {"": 1.0, "s": 1.0, "sec": 1.0, "min": 60.0}.get(unit.strip().lower())
+    if per is None:
+        raise ValueError(f"Invalid rate '{text}'. Use e.g. 2000/s or 90/min.")
+    rate = float(number) / per
+    if rate <= 0:
+        raise ValueError("rate must be > 0")
+    return rate
+
+
+def plan_rate(rate: float) -> tuple[float, int]:
+    """Choose (interval, batch) so `rate` actions/s needs at most MAX_WAKEUPS_PER_SEC wakeups."""
+    batch = max(1, math.ceil(rate / MAX_WAKEUPS_PER_SEC))
+    return batch / rate, batch
+
+
+CALIBRATE_CALLS = 200  # timed calls per backend and action
+
+
+def calibration_path() -> str:
+    """Per-machine profile written by --calibrate (%APPDATA% on Windows, else $XDG_CONFIG_HOME or ~/.config)."""
+    base = os.environ.get("APPDATA") if sys.platform == "win32" else None
+    base = base or os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "spam_key", "calibration.json")
+
+
+def load_calibration(path: str | None = None) -> dict:
+    """Return the saved calibration profile, or {} if there is none (or it is unreadable)."""
+    try:
+        with open(path or calibration_path(), encoding="utf-8") as fh:
+            profile = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return profile if isinstance(profile, dict) else {}
+
+
+def rate_limit(backend: str | Backend, mode: str, profile: dict | None = None) -> float | None:
+    """Calibrated sustainable actions/s for `backend` in `mode` ("key" or "click"), if measured."""
+    name = backend.name if isinstance(backend, Backend) else backend.partition(":")[0]
+    profile = load_calibration() if profile is None else profile
+    entry = profile.get("backends", {}).get(name, {}).get(mode)
+    return entry.get("max_rate") if isinstance(entry, dict) else None
+
+
+def check_rate_limit(backend: str | Backend, mode: str, interval: float, batch: int = 1, clamp: bool = False) -> float:
+    """Compare the requested rate with the calibrated limit and return the interval to use.
+
+    Over the limit it prints a warning, or with `clamp` lengthens the interval to
+    the limit. Without a profile entry the interval is returned unchanged.
+    """
+    limit = rate_limit(backend, mode)
+    requested = batch / interval
+    if not limit or requested <= limit:
+        return interval
+    name = backend.name if isinstance(backend, Backend) else backend.partition(":")[0]
+    what = "presses" if mode == "key" else "clicks"
+    if clamp:
+        print(
+            f"Clamped: {name} sustains about {limit:.0f} {what}/s here; interval raised from {interval:g}s "
+            f"to {batch / limit:.4g}s.",
+            file=sys.stderr,
+        )
+        return batch / limit
+    print(
+        f"Warning: {requested:.0f} {what}/s requested but {name} sustained about {limit:.0f}/s when calibrated; "
+        "expect fewer (use --clamp to cap the rate).",
+        file=sys.stderr,
+    )
+    return interval
+
+
+def calibrate_backend(sender: Backend, mode: str, target: str, calls: int = CALIBRATE_CALLS) -> dict:
+    """Time `calls` back-to-back press (key) or click calls; the sustainable rate comes from the p90 call."""
+    send = sender.press if mode == "key" else sender.click
+    times = []
+    for _ in range(calls):
+        began = time.perf_counter()
+        send(target)
+        times.append(time.perf_counter() - began)
+    times.sort()
+    p90 = _percentile(times, 90)
+    return {
+        "calls": calls,
+        "call_p50_ms": _percentile(times, 50) * 1000,
+        "call_p90_ms": p90 * 1000,
+        "max_rate": 1 / p90 if p90 > 0 else math.inf,
+    }
+
+
+def calibrate(
+    backends: list[str] | None = None,
+    key: str = "shift",
+    button: str = "left",
+    calls: int = CALIBRATE_CALLS,
+    path: str | None = None,
+) -> dict:
+    """Measure every available backend for key presses and clicks and save the profile.
+
+    This sends real input: `calls` taps of `key` and `calls` clicks of `button`
+    at the current pointer position, per backend. Backends that cannot be built
+    here (e.g. a missing library) are recorded with an error.
+    Entries for backends not measured this time are kept.
+    """
+    path = path or calibration_path()
+    profile = load_calibration(path)
+    results = profile.setdefault("backends", {})
+    for name in backends or [n for n in available_backends() if n != "null"]:
+        try:
+            sender = get_backend(name)
+        except (RuntimeError, ValueError) as exc:
+            results[name] = {"error": str(exc)}
+            continue
+        try:
+            results[name] = {
+                "key": calibrate_backend(sender, "key", key, calls),
+                "click": calibrate_backend(sender, "click", button, calls),
+            }
+        finally:
+            sender.close()
+    profile.update(host=socket.gethostname(), platform=sys.platform, measured_at=time.time())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(profile, fh, indent=2)
+    return profile
+
+
+def print_calibration(profile: dict) -> None:
+    print(f"{'backend':<14} {'action':<6} {'p50 ms':>8} {'p90 ms':>8} {'max/s':>9}")
+    for name, entry in profile.get("backends", {}).items():
+        if "error" in entry:
+            print(f"{name:<14} skipped: {entry['error']}")
+            continue
+        for mode in ("key", "click"):
+            m = entry[mode]
+            print(f"{name:<14} {mode:<6} {m['call_p50_ms']:>8.3f} {m['call_p90_ms']:>8.3f} {m['max_rate']:>9.0f}")
+
+
+def _find_window(title: str):
+    matches = _require("pygetwindow").getWindowsWithTitle(title)
+    if not matches:
+        raise RuntimeError(f"No window found with title containing '{title}'.")
+    return matches[0]
+
+
+# Focus state after the last FocusTracker.ensure(), as stored in event logs.
+FOCUS_UNTRACKED, FOCUS_KEPT, FOCUS_ACTIVATED, FOCUS_MISSING = range(4)
+FOCUS_STATES = ("untracked", "kept", "activated", "missing")
+
+
+class FocusTracker:
+    """Keep a target window in the foreground without activating it on every action.
+
+    The window found by title is cached. ensure() asks the window whether it is
+    still the foreground one (a single GetForegroundWindow-style call) and only
+    activates it when focus was actually lost. If the cached handle goes stale the
+    title is looked up again, at most every RESOLVE_RETRY seconds. `state` holds
+    the outcome of the last check (one of the FOCUS_* values).
+    """
+
+    RESOLVE_RETRY = 0.5
+
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.checks = 0
+        self.activations = 0
+        self.resolves = 1
+        self.state = FOCUS_KEPT
+        self._window = _find_window(title)
+        self._next_resolve = 0.0
+
+    def ensure(self) -> None:
+        self.checks += 1
+        window = self._window
+        try:
+            if window is None:
+                now = time.perf_counter()
+                if now < self._next_resolve:
+                    self.state = FOCUS_MISSING
+                    return
+                self._next_resolve = now + self.RESOLVE_RETRY
+                self.resolves += 1
+                window = self._window = _find_window(self.title)
+            if window.isActive:
+                self.state = FOCUS_KEPT
+                return
+            window.activate()
+            self.activations += 1
+            self.state = FOCUS_ACTIVATED
+        except Exception:
+            self._window = None  # handle closed or window gone; look it up again
+            self.state = FOCUS_MISSING
+
+    def report(self, stats: dict | None) -> None:
+        if stats is not None:
+            stats.update(focus_checks=self.checks, focus_activations=self.activations, focus_resolves=self.resolves)
+
+
+DEFAULT_CHECK_RATE = 30.0  # screen checks per second for conditional runs
+DEFAULT_TOLERANCE = 10  # per-channel colour difference (0-255) still counted as a match
+
+
+class ScreenCondition:
+    """A small screen region and what it must show for actions to fire.
+
+    Either `color` (any pixel in the region within `tolerance` of an RGB colour
+    on every channel) or `template` (an RGB image found anywhere in the region
+    with a root-mean-square channel difference of at most `tolerance`). Frames are
+    H x W x 3 uint8 NumPy arrays. The template search scores every placement at
+    once: sum((F - T)^2) = sum(F^2) - 2 F.T + sum(T^2), with the cross term from
+    an FFT correlation and sum(F^2) from an integral image.
+    """
+
+    def __init__(
+        self,
+        region: tuple[int, int, int, int],
+        color: tuple[int, int, int] | None = None,
+        template=None,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> None:
+        if (color is None) == (template is None):
+            raise ValueError("A screen condition needs exactly one of a colour or a template image.")
+        if region[2] <= 0 or region[3] <= 0:
+            raise ValueError("Screen region width and height must be > 0.")
+        if tolerance < 0:
+            raise ValueError("tolerance must be >= 0")
+        np = _require("numpy")
+        self._np = np
+        self.region = region
+        self.tolerance = tolerance
+        self.color = None if color is None else np.array(color, dtype=np.int16)
+        self.template = None if template is None else np.asarray(template, dtype=np.float64)
+        if self.template is not None and (
+            self.template.ndim != 3 or self.template.shape[0] > region[3] or self.template.shape[1] > region[2]
+        ):
+            raise ValueError("The template must be an RGB image no larger than the screen region.")
+        self.score = math.inf  # best difference seen in the last matched frame
+        self._template_fft = None  # conjugate template spectrum for the current frame shape
+        self._fft_shape: tuple[int, int] | None = None
+
+    def matches(self, frame) -> bool:
+        np = self._np
+        if self.color is not None:
+            frame = np.asarray(frame, dtype=np.int16)
+            self.score = float(np.abs(frame - self.color).max(axis=2).min())
+            return self.score <= self.tolerance
+
+        frame = np.asarray(frame, dtype=np.float64)
+        template = self.template
+        (height, width), (h, w) = frame.shape[:2], template.shape[:2]
+        if height < h or width < w:
+            return False
+        if self._fft_shape != (height, width):
+            self._fft_shape = (height, width)
+            self._template_fft = np.fft.rfft2(template, s=self._fft_shape, axes=(0, 1)).conj()
+        spectrum = np.fft.rfft2(frame, axes=(0, 1)) * self._template_fft
+        # Circular correlation; the valid placements never wrap around.
+        cross = np.fft.irfft2(spectrum, s=self._fft_shape, axes=(0, 1)).sum(axis=2)[: height - h + 1, : width - w + 1]
+        squares = np.pad((frame**2).sum(axis=2).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+        window_squares = squares[h:, w:] - squares[:-h, w:] - squares[h:, :-w] + squares[:-h, :-w]
+        ssd = window_squares - 2 * cross + (template**2).sum()
+        self.score = math.sqrt(max(0.0, float(ssd.min())) / template.size)
+        # FFT rounding leaves ~1e-6 of noise on an exact match.
+        return self.score <= self.tolerance + 1e-3
+
+
+def _grab_region(region: tuple[int, int, int, int]):
+    """Capture only `region` of the screen as an RGB NumPy array."""
+    image = _require("pyautogui").screenshot(region=region)
+    return _require("numpy").asarray(image.convert("RGB"))
+
+
+def parse_condition(spec: str, tolerance: float = DEFAULT_TOLERANCE) -> ScreenCondition:
+    """Build a ScreenCondition from ``pixel:X,Y[,W,H],#RRGGBB`` or ``image:PATH@LEFT,TOP,WIDTH,HEIGHT``."""
+    kind, _, body = spec.partition(":")
+    try:
+        if kind == "pixel":
+            *coords, color = body.split(",")
+            numbers = [int(v) for v in coords]
+            if len(numbers) not in (2, 4):
+                raise ValueError
+            region = tuple(numbers) if len(numbers) == 4 else (numbers[0], numbers[1], 1, 1)
+            color = color.strip().lstrip("#")
+            if len(color) != 6:
+                raise ValueError
+            rgb = tuple(int(color[i : i + 2], 16) for i in (0, 2, 4))
+            return ScreenCondition(region, color=rgb, tolerance=tolerance)
+        if kind == "image":
+            path, _, region_text = body.rpartition("@")
+            region = tuple(int(v) for v in region_text.split(","))
+            if not path or len(region) != 4:
+                raise ValueError
+        else:
+            raise ValueError
+    except ValueError:
+        raise ValueError(
+            f"Invalid screen condition '{spec}'. Use pixel:X,Y,#RRGGBB, pixel:X,Y,W,H,#RRGGBB "
+            "or image:PATH@LEFT,TOP,WIDTH,HEIGHT."
+        ) from None
+    image = _require("PIL.Image", "pillow").open(path).convert("RGB")
+    return ScreenCondition(region, template=_require("numpy").asarray(image), tolerance=tolerance)
+
+
+class ScreenWatcher:
+    """Re-check a ScreenCondition `rate` times per second on its own thread.
+
+    The action scheduler only reads `matched`, so capturing and matching never
+    delay a press. The previous frame is kept and an unchanged frame reuses the
+    previous result without matching again.
+    """
+
+    def __init__(self, condition: ScreenCondition, rate: float = DEFAULT_CHECK_RATE, grab=None) -> None:
+        if rate <= 0:
+            raise ValueError("check rate must be > 0")
+        self.condition = condition
+        self.period = 1 / rate
+        self.grab = grab or _grab_region
+        self.matched = False
+        self.error: str | None = None
+        self.checks = 0
+        self.changes = 0
+        self._previous = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def check(self) -> bool:
+        frame = self.grab(self.condition.region)
+        self.checks += 1
+        previous, self._previous = self._previous, frame
+        if previous is None or not self.condition._np.array_equal(frame, previous):
+            self.changes += 1
+            self.matched = self.condition.matches(frame)
+        return self.matched
+
+    def start(self) -> None:
+        """Check once right away (so capture errors surface here), then keep checking in the background."""
+        self.check()
+        self._thread = threading.Thread(target=self._run, name="spam-screen-watch", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        next_at = time.perf_counter()
+        while True:
+            # Fall behind rather than queue captures if one ran long.
+            next_at = max(next_at + self.period, time.perf_counter())
+            if self._stop.wait(next_at - time.perf_counter()):
+                return
+            try:
+                self.check()
+            except Exception as exc:  # surfaced by the job that owns the watcher
+                self.error = str(exc)
+                self.matched = False
+                return
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+
+def spam_key(
+    key: str,
+    interval: float,
+    duration: float,
+    start_delay: float,
+    hold: float,
+    target_window: str | None,
+    force_focus: bool,
+    stop_event: threading.Event | None = None,
+    backend: str | Backend = "pyautogui",
+    catch_up: str = "skip",
+    stats: dict | None = None,
+    timing: TimingRecorder | None = None,
+    batch: int = 1,
+    when: ScreenCondition | None = None,
+    check_rate: float = DEFAULT_CHECK_RATE,
+    clamp: bool = False,
+    log: EventLog | None = None,
+    jitter: Jitter | None = None,
+    hold_jitter: Jitter | None = None,
+) -> int:
+    """Send key presses at a fixed interval for the given duration.
+
+    Presses are scheduled on absolute deadlines (see DeadlineScheduler), so the
+    rate does not drift with backend call time. Returns the number of presses performed;
+    focus counters from FocusTracker are written into `stats` when a dict is given.
+    With `batch` > 1 each deadline sends that many taps in one backend call
+    (burst mode for rates beyond one Python loop iteration per event).
+
+    Holds and chords ("ctrl+c") run on a JobEngine, where key-down and key-up are
+    separate timed events: presses start every `interval` whatever `hold` is, and
+    a hold longer than the interval overlaps the next press. So do conditional
+    runs: with `when`, a press is only sent while the screen matches it.
+
+    A rate above the backend's calibrated limit (see calibrate) prints a
+    warning, or with `clamp` is lowered to that limit. With `log`, every press
+    is also written to that EventLog.
+
+    `jitter` replaces the fixed interval with draws from a Jitter (its mean is
+    what the rate checks see), and `hold_jitter` draws each hold the same way;
+    their report() gives the distribution actually used once the run is over.
+    """
+    _validate_run(interval, duration, start_delay, hold, catch_up, target_window, batch)
+    if jitter:
+        jitter.scale(check_rate_limit(backend, "key", jitter.mean, batch, clamp) / jitter.mean)
+    else:
+        interval = check_rate_limit(backend, "key", interval, batch, clamp)
+    if hold > 0 or hold_jitter or len(chord_keys(key)) > 1 or when:
+        job = Job(
+            "key", key, interval, duration, start_delay, hold, target_window, force_focus, backend, catch_up,
+            batch=batch, when=when, check_rate=check_rate, log=log, jitter=jitter, hold_jitter=hold_jitter,
+        )
+        job.timing = timing
+        return _run_job(job, stop_event, stats)
+    focus = FocusTracker(target_window) if target_window else None
+    sender = get_backend(backend)
+
+    if start_delay:
+        _wait_with_cancel(start_delay, stop_event)
+        if stop_event and stop_event.is_set():
+            _release_backend(sender, backend)
+            return 0
+
+    start = time.perf_counter()
+    end_at = None if duration == 0 else start + duration
+    scheduler = DeadlineScheduler(interval, end_at, catch_up, start, jitter)
+    presses = 0
+    if log:
+        log.write(LOG_START)
+
+    try:
+        while scheduler.wait(stop_event):
+            if focus and force_focus:
+                focus.ensure()
+            sent = time.perf_counter()
+            if batch == 1:
+                sender.press(key)
+            else:
+                sender.press_many(key, batch)
+            if timing:
+                timing.record(scheduler.deadline, sent, time.perf_counter() - sent, 0.0, batch)
+            if log:
+                state = focus.state if focus and force_focus else FOCUS_UNTRACKED
+                log.write(LOG_PRESS, sent - scheduler.deadline, time.perf_counter() - sent, state, 0, batch)
+            presses += batch
+    except KeyboardInterrupt:
+        print("\nStopped early (Ctrl+C).", flush=True)
+    finally:
+        _release_backend(sender, backend)
+        if log:
+            log.write(LOG_STOP, actions=presses)
+
+    if focus:
+        focus.report(stats)
+    return presses
+
+
+def spam_click(
+    button: str,
+    interval: float,
+    duration: float,
+    start_delay: float,
+    hold: float,
+    target_window: str | None,
+    force_focus: bool,
+    stop_event: threading.Event | None = None,
+    backend: str | Backend = "pyautogui",
+    catch_up: str = "skip",
+    stats: dict | None = None,
+    timing: TimingRecorder | None = None,
+    batch: int = 1,
+    when: ScreenCondition | None = None,
+    check_rate: float = DEFAULT_CHECK_RATE,
+    clamp: bool = False,
+    log: EventLog | None = None,
+    jitter: Jitter | None = None,
+    hold_jitter: Jitter | None = None,
+) -> int:
+    """Spam mouse clicks at a fixed interval (`batch` clicks per interval).
+
+    Holds, `when`, `clamp`, `log` and the jitters behave as in spam_key.
+    """
+    _validate_run(interval, duration, start_delay, hold, catch_up, target_window, batch)
+    if jitter:
+        jitter.scale(check_rate_limit(backend, "click", jitter.mean, batch, clamp) / jitter.mean)
+    else:
+        interval = check_rate_limit(backend, "click", interval, batch, clamp)
+    if hold > 0 or hold_jitter or when:
+        job = Job(
+            "click", button, interval, duration, start_delay, hold, target_window, force_focus, backend, catch_up,
+            batch=batch, when=when, check_rate=check_rate, log=log, jitter=jitter, hold_jitter=hold_jitter,
+        )
+        job.timing = timing
+        return _run_job(job, stop_event, stats)
+    focus = FocusTracker(target_window) if target_window else None
+    sender = get_backend(backend)
+
+    if start_delay:
+        _wait_with_cancel(start_delay, stop_event)
+        if stop_event and stop_event.is_set():
+            _release_backend(sender, backend)
+            return 0
+
+    start = time.perf_counter()
+    end_at = None if duration == 0 else start + duration
+    scheduler = DeadlineScheduler(interval, end_at, catch_up, start, jitter)
+    clicks = 0
+    if log:
+        log.write(LOG_START)
+
+    try:
+        while scheduler.wait(stop_event):
+            sent = time.perf_counter()
+            if batch == 1:
+                sender.click(button)
+            else:
+                sender.click_many(button, batch)
+            if timing:
+                timing.record(scheduler.deadline, sent, time.perf_counter() - sent, 0.0, batch)
+            if log:
+                state = focus.state if focus and force_focus else FOCUS_UNTRACKED
+                log.write(LOG_CLICK, sent - scheduler.deadline, time.perf_counter() - sent, state, 0, batch)
+            if focus and force_focus:
+                focus.ensure()
+            clicks += batch
+    finally:
+        _release_backend(sender, backend)
+        if log:
+            log.write(LOG_STOP, actions=clicks)
+
+    if focus:
+        focus.report(stats)
+    return clicks
+
+
+def _run_job(job: Job, stop_event: threading.Event | None, stats: dict | None) -> int:
+    """Run one Job on a private JobEngine, blocking like the plain spam loops."""
+    engine = JobEngine()
+    engine.add(job)
+    if stop_event is not None:
+
+        def forward_stop() -> None:
+            # Event.wait returns as soon as the event is set; the timeout only lets
+            # this thread notice that the job ended on its own and exit.
+            while not stop_event.wait(0.5):
+                if job.done.is_set():
+                    return
+            job.stop()
+
+        threading.Thread(target=forward_stop, name="spam-stop", daemon=True).start()
+    try:
+        while not job.done.wait(0.2):  # returns on done; the timeout lets Ctrl+C through
+            pass
+    except KeyboardInterrupt:
+        print("\nStopped early (Ctrl+C).", flush=True)
+    finally:
+        engine.shutdown()
+    if job.error:
+        raise RuntimeError(job.error)
+    if job.focus:
+        job.focus.report(stats)
+    if job.watcher and stats is not None:
+        stats.update(screen_checks=job.watcher.checks, screen_changes=job.watcher.changes, screen_misses=job.misses)
+    return job.count
+
+
+_async_executor: ThreadPoolExecutor | None = None
+
+
+def _backend_executor() -> ThreadPoolExecutor:
+    """Single worker thread shared by the asyncio API, so backend calls stay ordered."""
+    global _async_executor
+    if _async_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _async_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spam-backend")
+    return _async_executor
+
+
+async def spam_iter(
+    mode: str,
+    target: str,
+    interval: float,
+    duration: float = 0,
+    start_delay: float = 0,
+    hold: float = 0,
+    target_window: str | None = None,
+    force_focus: bool = False,
+    backend: str | Backend = "pyautogui",
+    catch_up: str = "skip",
+    executor: Executor | None = None,
+    timing: TimingRecorder | None = None,
+) -> AsyncIterator[int]:
+    """Async counterpart of spam_key/spam_click that yields the running count after each action.
+
+    Waits happen on the event loop against the same absolute deadlines as
+    spam_key; every backend call runs on `executor` (a dedicated single thread
+    by default) so the loop never blocks. As in spam_key, a press starts every
+    `interval` and its release is a separate timed event, so holds may overlap.
+    Cancel the consuming task or leave the `async for` to stop; a key or button
+    still held is released.
+    """
+    import asyncio
+
+    if mode not in ("key", "click"):
+        raise ValueError("mode must be 'key' or 'click'")
+    _validate_run(interval, duration, start_delay, hold, catch_up, target_window)
+    loop = asyncio.get_running_loop()
+    executor = executor or _backend_executor()
+    # Building a backend imports its library, so that goes to the executor too.
+    sender = await loop.run_in_executor(executor, get_backend, backend)
+    keys = chord_keys(target) if mode == "key" else (target,)
+
+    def down() -> None:
+        for key in keys:
+            if mode == "key":
+                sender.key_down(key)
+            else:
+                sender.mouse_down(key)
+
+    def up() -> None:
+        for key in reversed(keys):
+            if mode == "key":
+                sender.key_up(key)
+            else:
+                sender.mouse_up(key)
+
+    def tap() -> None:
+        if len(keys) > 1:
+            down()
+            up()
+        elif mode == "key":
+            sender.press(target)
+        else:
+            sender.click(target)
+
+    held = 0
+    releases: set[asyncio.Task] = set()
+
+    async def release(deadline: float, sent: float, pressed: float) -> None:
+        nonlocal held
+        await asyncio.sleep(max(0.0, deadline + hold - time.perf_counter()))
+        if held == 1:  # overlapping holds keep the input down until the last one ends
+            await loop.run_in_executor(executor, up)
+        held -= 1
+        if timing:
+            timing.record(deadline, sent, pressed - sent, time.perf_counter() - pressed - hold)
+
+    # From here on the backend is ours to close, whether we finish, fail or are
+    # cancelled during the window lookup or the start delay.
+    try:
+        focus = await loop.run_in_executor(executor, FocusTracker, target_window) if target_window else None
+        if start_delay:
+            await asyncio.sleep(start_delay)
+
+        start = time.perf_counter()
+        end_at = None if duration == 0 else start + duration
+        scheduler = DeadlineScheduler(interval, end_at, catch_up, start)
+        count = 0
+        while True:
+            deadline = scheduler.next_deadline()
+            if deadline is None:
+                if releases:
+                    await asyncio.wait(releases)  # let the last holds run their full length
+                return
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if mode == "key" and focus and force_focus:
+                await loop.run_in_executor(executor, focus.ensure)
+            sent = time.perf_counter()
+            if hold > 0:
+                held += 1  # count first: a cancel during the call may land after the key went down
+                await loop.run_in_executor(executor, down)
+                task = asyncio.ensure_future(release(deadline, sent, time.perf_counter()))
+                releases.add(task)
+                task.add_done_callback(releases.discard)
+            else:
+                await loop.run_in_executor(executor, tap)
+                if timing:
+                    timing.record(deadline, sent, time.perf_counter() - sent)
+            if mode == "click" and focus and force_focus:
+                await loop.run_in_executor(executor, focus.ensure)
+            count += 1
+            yield count
+    finally:
+        for task in releases:
+            task.cancel()
+        # Not awaited: we may be unwinding a cancellation. The executor keeps the order.
+        if held:
+            executor.submit(up)
+        executor.submit(_release_backend, sender, backend)
+
+
+async def spam_key_async(key: str, interval: float, duration: float = 0, **kwargs) -> int:
+    """Awaitable spam_key; accepts spam_iter's keyword arguments. Returns presses sent."""
+    count = 0
+    async for count in spam_iter("key", key, interval, duration, **kwargs):
+        pass
+    return count
+
+
+async def spam_click_async(button: str, interval: float, duration: float = 0, **kwargs) -> int:
+    """Awaitable spam_click; accepts spam_iter's keyword arguments. Returns clicks sent."""
+    count = 0
+    async for count in spam_iter("click", button, interval, duration, **kwargs):
+        pass
+    return count
+
+
+# Sequence opcodes; the index doubles as the slot in run_sequence's dispatch table.
+OP_KEY_DOWN, OP_KEY_UP, OP_PRESS, OP_MOUSE_DOWN, OP_MOUSE_UP, OP_CLICK, OP_MOVE_TO, OP_CLICK_AT = range(8)
+SEQUENCE_OPS = {
+    "keyDown": (OP_KEY_DOWN, "key"),
+    "keyUp": (OP_KEY_UP, "key"),
+    "press": (OP_PRESS, "key"),
+    "mouseDown": (OP_MOUSE_DOWN, "button"),
+    "mouseUp": (OP_MOUSE_UP, "button"),
+    "click": (OP_CLICK, "button"),
+    "moveTo": (OP_MOVE_TO, None),
+    "clickAt": (OP_CLICK_AT, None),
+}
+MAX_PLAN_STEPS = 1_000_000
+
+
+class ActionPlan:
+    """A sequence compiled to parallel arrays: step i runs `opcodes[i]` with `args[i]`
+    at `offsets[i]` seconds after the start of a pass. `length` is the pass duration."""
+
+    def __init__(self) -> None:
+        self.offsets = array("d")
+        self.opcodes = array("B")
+        self.args: list[tuple] = []
+        self.length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+
+def parse_sequence_text(text: str) -> list[dict]:
+    """Parse the line-based sequence script into the step dicts used by JSON files.
+
+    One step per line, `#` starts a comment, `repeat N` ... `end` nests::
+
+        keyDown shift
+        repeat 3
+            press a
+            wait 0.05
+        end
+        keyUp shift
+        moveTo 400 300
+        click left
+        clickAt 640 360 right   # button defaults to left
+    """
+    root: list[dict] = []
+    stack = [root]
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        words = raw.split("#", 1)[0].split()
+        if not words:
+            continue
+        op, rest = words[0], words[1:]
+        try:
+            if op == "repeat":
+                block: list[dict] = []
+                stack[-1].append({"op": "repeat", "times": int(rest[0]), "steps": block})
+                stack.append(block)
+            elif op == "end":
+                if len(stack) == 1:
+                    raise ValueError("'end' without 'repeat'")
+                stack.pop()
+            elif op == "wait":
+                stack[-1].append({"op": "wait", "seconds": float(rest[0])})
+            elif op == "moveTo":
+                stack[-1].append({"op": "moveTo", "x": int(rest[0]), "y": int(rest[1])})
+            elif op == "clickAt":
+                button = rest[2] if len(rest) > 2 else "left"
+                stack[-1].append({"op": "clickAt", "x": int(rest[0]), "y": int(rest[1]), "button": button})
+            elif op in SEQUENCE_OPS:
+                stack[-1].append({"op": op, SEQUENCE_OPS[op][1]: rest[0]})
+            else:
+                raise ValueError(f"unknown step '{op}'")
+        except IndexError:
+            raise ValueError(f"line {lineno}: missing argument for '{op}'") from None
+        except ValueError as exc:
+            raise ValueError(f"line {lineno}: {exc}") from None
+    if len(stack) != 1:
+        raise ValueError("'repeat' block is missing its 'end'")
+    return root
+
+
+def load_sequence(path: str) -> list[dict]:
+    """Read steps from a .json file (a list, or {"steps": [...]}) or a text script."""
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    if not path.lower().endswith(".json"):
+        return parse_sequence_text(text)
+    data = json.loads(text)
+    steps = data.get("steps") if isinstance(data, dict) else data
+    if not isinstance(steps, list):
+        raise ValueError("sequence JSON must be a list of steps or an object with a 'steps' list")
+    return steps
+
+
+def _is_int(value: object) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)  # JSON true/false are ints in Python
+
+
+def compile_sequence(steps: list[dict]) -> ActionPlan:
+    """Validate `steps` and flatten them (repeats unrolled, waits folded into offsets)."""
+    plan = ActionPlan()
+
+    def emit(block: object, where: str) -> None:
+        if not isinstance(block, list) or not block:
+            raise ValueError(f"{where}: expected a non-empty list of steps")
+        for index, step in enumerate(block, 1):
+            at = f"{where} step {index}"
+            if not isinstance(step, dict):
+                raise ValueError(f"{at}: expected an object with an 'op'")
+            op = step.get("op")
+            if op == "wait":
+                seconds = step.get("seconds")
+                if not isinstance(seconds, (int, float)) or isinstance(seconds, bool) or seconds < 0:
+                    raise ValueError(f"{at}: wait needs 'seconds' >= 0")
+                plan.length += seconds
+            elif op == "repeat":
+                times = step.get("times")
+                if not _is_int(times) or times < 1:
+                    raise ValueError(f"{at}: repeat needs integer 'times' >= 1")
+                for _ in range(times):
+                    emit(step.get("steps"), at)
+            elif op in ("moveTo", "clickAt"):
+                x, y = step.get("x"), step.get("y")
+                if not _is_int(x) or not _is_int(y):
+                    raise ValueError(f"{at}: {op} needs integer 'x' and 'y'")
+                if op == "moveTo":
+                    add(OP_MOVE_TO, (x, y))
+                else:
+                    button = step.get("button", "left")
+                    if not isinstance(button, str) or not button:
+                        raise ValueError(f"{at}: clickAt needs a non-empty 'button'")
+                    add(OP_CLICK_AT, (x, y, button))
+            elif op in SEQUENCE_OPS:
+                opcode, field = SEQUENCE_OPS[op]
+                value = step.get(field)
+                if not isinstance(value, str) or not value:
+                    raise ValueError(f"{at}: {op} needs a non-empty '{field}'")
+                add(opcode, (value,))
+            else:
+                raise ValueError(f"{at}: unknown op {op!r}")
+
+    def add(opcode: int, args: tuple) -> None:
+        if len(plan) >= MAX_PLAN_STEPS:
+            raise ValueError(f"sequence expands to more than {MAX_PLAN_STEPS} steps")
+        plan.offsets.append(plan.length)
+        plan.opcodes.append(opcode)
+        plan.args.append(args)
+
+    emit(steps, "sequence")
+    return plan
+
+
+PATH_RATE = 120.0  # pointer updates per second along a glide
+
+
+def parse_points(spec: str) -> list[tuple[int, int]]:
+    """Parse ``X,Y;X,Y;...`` or ``grid:LEFT,TOP,COLUMNS,ROWS,DX,DY`` (row by row) into screen points."""
+    try:
+        if spec.startswith("grid:"):
+            left, top, columns, rows, dx, dy = (int(v) for v in spec[5:].split(","))
+            if columns < 1 or rows < 1:
+                raise ValueError
+            return [(left + c * dx, top + r * dy) for r in range(rows) for c in range(columns)]
+        points = []
+        for item in spec.split(";"):
+            x, y = item.split(",")
+            points.append((int(x), int(y)))
+        return points
+    except ValueError:
+        raise ValueError(
+            f"Invalid points '{spec}'. Use X,Y;X,Y;... or grid:LEFT,TOP,COLUMNS,ROWS,DX,DY."
+        ) from None
+
+
+def mouse_path(points: list[tuple[int, int]], seconds: float, rate: float = PATH_RATE, smooth: bool = True):
+    """Precompute a pointer path through `points` as a NumPy (t, x, y) array.
+
+    Samples are `rate` per second over `seconds`, spread by distance along the
+    polyline (eased in and out when `smooth`), rounded to pixels, with repeated
+    positions dropped. The last row is always the final point at t = `seconds`.
+    """
+    np = _require("numpy")
+    if len(points) < 2:
+        raise ValueError("a path needs at least two points")
+    if seconds <= 0 or rate <= 0:
+        raise ValueError("path seconds and rate must be > 0")
+    xy = np.asarray(points, dtype=np.float64)
+    along = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))))
+    t = np.append(np.arange(1, math.ceil(seconds * rate)) / rate, seconds)
+    progress = t / seconds
+    if smooth:
+        progress = progress * progress * (3 - 2 * progress)  # smoothstep easing
+    distance = progress * along[-1]
+    x = np.rint(np.interp(distance, along, xy[:, 0]))
+    y = np.rint(np.interp(distance, along, xy[:, 1]))
+    moved = np.ones(len(t), dtype=bool)
+    moved[1:] = (np.diff(x) != 0) | (np.diff(y) != 0)
+    return np.column_stack((t, x, y))[moved]
+
+
+def _add_path(plan: ActionPlan, path, at: float) -> None:
+    offsets = path[:, 0] + at
+    plan.offsets.extend(offsets.tolist())
+    plan.opcodes.extend([OP_MOVE_TO] * len(path))
+    plan.args.extend(zip(path[:, 1].astype(int).tolist(), path[:, 2].astype(int).tolist()))
+
+
+def path_plan(path) -> ActionPlan:
+    """Turn a mouse_path array into an ActionPlan of timed moves for run_sequence."""
+    plan = ActionPlan()
+    _add_path(plan, path, 0.0)
+    plan.length = float(path[-1, 0]) if len(path) else 0.0
+    return plan
+
+
+def click_pattern(
+    points: list[tuple[int, int]],
+    interval: float,
+    button: str = "left",
+    glide: float = 0.0,
+    rate: float = PATH_RATE,
+) -> ActionPlan:
+    """Click each of `points` in turn, one every `interval` seconds.
+
+    Each click is a single click_at call. With `glide` > 0 the pointer also
+    travels to each point along a precomputed smooth path during the `glide`
+    seconds before its click (the first point of a pass is jumped to).
+    """
+    if not points:
+        raise ValueError("a click pattern needs at least one point")
+    if interval <= 0:
+        raise ValueError("interval must be > 0")
+    if not 0 <= glide < interval:
+        raise ValueError("glide must be >= 0 and shorter than the interval")
+    if len(points) * (1 + glide * rate) > MAX_PLAN_STEPS:
+        raise ValueError(f"click pattern expands to more than {MAX_PLAN_STEPS} steps")
+    plan = ActionPlan()
+    for i, (x, y) in enumerate(points):
+        at = i * interval
+        if glide and i:
+            path = mouse_path([points[i - 1], (x, y)], glide, rate)
+            _add_path(plan, path[:-1], at - glide)  # the click itself lands on the last point
+        plan.offsets.append(at)
+        plan.opcodes.append(OP_CLICK_AT)
+        plan.args.append((x, y, button))
+    plan.length = len(points) * interval
+    return plan
+
+
+def run_sequence(
+    plan: ActionPlan,
+    repeat: int,
+    duration: float,
+    start_delay: float,
+    target_window: str | None,
+    force_focus: bool,
+    stop_event: threading.Event | None = None,
+    backend: str | Backend = "pyautogui",
+    catch_up: str = "skip",
+    stats: dict | None = None,
+    timing: TimingRecorder | None = None,
+    log: EventLog | None = None,
+) -> int:
+    """Play a compiled plan `repeat` times (0 = until duration/Stop).
+
+    Each pass starts on its own absolute deadline and every step fires at
+    pass start + its offset. Keys and buttons still down when the run ends are
+    released. Returns the number of steps sent; each is also written to `log`.
+    """
+    _validate_run(None, duration, start_delay, 0, catch_up, target_window)
+    if repeat < 0:
+        raise ValueError("repeat must be >= 0")
+    if repeat != 1 and plan.length <= 0:
+        raise ValueError("a repeated sequence needs at least one wait step")
+    focus = FocusTracker(target_window) if target_window else None
+    sender = get_backend(backend)
+    held_keys: set[str] = set()
+    held_buttons: set[str] = set()
+
+    def key_down(key: str) -> None:
+        sender.key_down(key)
+        held_keys.add(key)
+
+    def key_up(key: str) -> None:
+        sender.key_up(key)
+        held_keys.discard(key)
+
+    def mouse_down(button: str) -> None:
+        sender.mouse_down(button)
+        held_buttons.add(button)
+
+    def mouse_up(button: str) -> None:
+        sender.mouse_up(button)
+        held_buttons.discard(button)
+
+    dispatch = [key_down, key_up, sender.press, mouse_down, mouse_up, sender.click, sender.move_to, sender.click_at]
+    offsets, opcodes, args = plan.offsets, plan.opcodes, plan.args
+    steps = len(plan)
+
+    if start_delay:
+        _wait_with_cancel(start_delay, stop_event)
+        if stop_event and stop_event.is_set():
+            _release_backend(sender, backend)
+            return 0
+
+    start = time.perf_counter()
+    end_at = None if duration == 0 else start + duration
+    scheduler = DeadlineScheduler(plan.length or 1.0, end_at, catch_up, start)
+    sent = 0
+    if log:
+        log.write(LOG_START)
+
+    try:
+        while (repeat == 0 or scheduler.ticks < repeat) and scheduler.wait(stop_event):
+            pass_start = scheduler.deadline
+            for i in range(steps):
+                deadline = pass_start + offsets[i]
+                # The scheduler ends the outer loop too once stopped or past end_at.
+                if (end_at is not None and deadline >= end_at) or not _wait_until(deadline, stop_event):
+                    break
+                if focus and force_focus:
+                    focus.ensure()
+                began = time.perf_counter()
+                dispatch[opcodes[i]](*args[i])
+                if timing:
+                    timing.record(deadline, began, time.perf_counter() - began)
+                if log:
+                    state = focus.state if focus and force_focus else FOCUS_UNTRACKED
+                    log.write(LOG_STEP, began - deadline, time.perf_counter() - began, state)
+                sent += 1
+    except KeyboardInterrupt:
+        print("\nStopped early (Ctrl+C).", flush=True)
+    finally:
+        for key in held_keys:
+            sender.key_up(key)
+        for button in held_buttons:
+            sender.mouse_up(button)
+        _release_backend(sender, backend)
+        if log:
+            log.write(LOG_STOP, actions=sent)
+
+    if focus:
+        focus.report(stats)
+    return sent
+
+
+# Recording file (.skrec): HEADER, then `count` fixed-size RECORDs, then the name
+# table (newline-separated UTF-8) that key/button codes index into. dt is the
+# nanoseconds since the previous event; x/y carry the position or scroll delta.
+RECORD_MAGIC = b"SKRC"
+RECORD_VERSION = 1
+RECORD_HEADER = struct.Struct("<4sHxxQQ")  # magic, version, record count, name table offset
+RECORD = struct.Struct("<BxHiiQ")  # type, code, x, y, dt_ns
+EV_KEY_DOWN, EV_KEY_UP, EV_MOUSE_DOWN, EV_MOUSE_UP, EV_MOVE, EV_SCROLL = range(1, 7)
+
+
+class InputRecorder:
+    """Capture keyboard (and mouse, if the `mouse` package is installed) events to a .skrec file.
+
+    Hook callbacks only pack a record into a preallocated buffer, which is
+    written out whenever it fills, so long recordings never sit in memory.
+    """
+
+    BUFFER_RECORDS = 4096
+
+    def __init__(self, path: str, stop_key: str | None = "esc", with_mouse: bool = True) -> None:
+        self.path = path
+        self.stop_key = stop_key
+        self.with_mouse = with_mouse and HAS_MOUSE
+        self.count = 0
+        self.stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._names: dict[str, int] = {}
+        self._buffer = bytearray(RECORD.size * self.BUFFER_RECORDS)
+        self._used = 0
+        self._last_ns = 0
+        self._fh = None
+        self._hooks: list[tuple[object, object]] = []
+
+    def start(self) -> None:
+        keyboard = _require("keyboard")
+        self._fh = open(self.path, "wb")
+        self._fh.write(RECORD_HEADER.pack(RECORD_MAGIC, RECORD_VERSION, 0, 0))
+        self._last_ns = time.perf_counter_ns()
+        self._hooks.append((keyboard, keyboard.hook(self._on_key)))
+        if self.with_mouse:
+            mouse = _require("mouse")
+            self._hooks.append((mouse, mouse.hook(self._on_mouse)))
+
+    def stop(self) -> int:
+        """Remove the hooks, finish the file and return the number of events recorded."""
+        for module, handle in self._hooks:
+            try:
+                module.unhook(handle)
+            except Exception:
+                pass
+        self._hooks.clear()
+        with self._lock:
+            if self._fh is None:
+                return self.count
+            self._flush()
+            names_offset = self._fh.tell()
+            self._fh.write("\n".join(self._names).encode("utf-8"))
+            self._fh.seek(0)
+            self._fh.write(RECORD_HEADER.pack(RECORD_MAGIC, RECORD_VERSION, self.count, names_offset))
+            self._fh.close()
+            self._fh = None
+        self.stopped.set()
+        return self.count
+
+    def _code(self, name: str) -> int:
+        code = self._names.get(name)
+        if code is None:
+            code = self._names[name] = len(self._names)
+        return code
+
+    def _append(self, kind: int, name: str | None, x: int = 0, y: int = 0) -> None:
+        now = time.perf_counter_ns()
+        with self._lock:
+            if self._fh is None:
+                return
+            code = self._code(name) if name is not None else 0
+            RECORD.pack_into(self._buffer, self._used, kind, code, x, y, now - self._last_ns)
+            self._last_ns = now
+            self._used += RECORD.size
+            self.count += 1
+            if self._used == len(self._buffer):
+                self._flush()
+
+    def _flush(self) -> None:
+        self._fh.write(memoryview(self._buffer)[: self._used])
+        self._used = 0
+
+    def _on_key(self, event) -> None:
+        name = (event.name or f"scan{event.scan_code}").lower()
+        if self.stop_key and name == self.stop_key:
+            if event.event_type == "down":
+                threading.Thread(target=self.stop, daemon=True).start()
+            return
+        self._append(EV_KEY_DOWN if event.event_type == "down" else EV_KEY_UP, name)
+
+    def _on_mouse(self, event) -> None:
+        kind = type(event).__name__
+        if kind == "MoveEvent":
+            self._append(EV_MOVE, None, event.x, event.y)
+        elif kind == "ButtonEvent":
+            self._append(EV_MOUSE_UP if event.event_type == "up" else EV_MOUSE_DOWN, event.button)
+        elif kind == "WheelEvent":
+            self._append(EV_SCROLL, None, int(event.delta))
+
+
+def replay_recording(
+    path: str,
+    start_delay: float,
+    stop_event: threading.Event | None = None,
+    backend: str | Backend = "pyautogui",
+    speed: float = 1.0,
+) -> int:
+    """Stream a .skrec file through `backend` with the recorded timing.
+
+    The file is memory-mapped and records are unpacked one at a time, so
+    recording length does not matter. Event i fires at start + (sum of dt up to i)
+    / speed, an absolute deadline, so timing does not drift over long replays.
+    Keys and buttons still down at the end are released. Returns events sent.
+    """
+    if start_delay < 0:
+        raise ValueError("start_delay must be >= 0")
+    if speed <= 0:
+        raise ValueError("speed must be > 0")
+    held_keys: set[str] = set()
+    held_buttons: set[str] = set()
+    sent = 0
+
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size < RECORD_HEADER.size:  # mmap cannot map an empty file
+            raise ValueError(f"{path} is not a spam_key recording")
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    with mm:
+        magic, version, count, names_offset = RECORD_HEADER.unpack_from(mm, 0)
+        if magic != RECORD_MAGIC or version != RECORD_VERSION:
+            raise ValueError(f"{path} is not a spam_key recording")
+        names = mm[names_offset:].decode("utf-8").split("\n") if count else []
+        names = [_key_alias(name) for name in names]  # `keyboard` spellings -> backend ones
+        sender = get_backend(backend)
+        can_scroll = sender.can_scroll
+
+        if start_delay:
+            _wait_with_cancel(start_delay, stop_event)
+            if stop_event and stop_event.is_set():
+                _release_backend(sender, backend)
+                return 0
+
+        view = memoryview(mm)[RECORD_HEADER.size : RECORD_HEADER.size + count * RECORD.size]
+        records = RECORD.iter_unpack(view)
+        start = time.perf_counter()
+        elapsed_ns = 0
+        try:
+            for kind, code, x, y, dt in records:
+                elapsed_ns += dt
+                if not _wait_until(start + elapsed_ns / 1e9 / speed, stop_event):
+                    break
+                if kind == EV_KEY_DOWN:
+                    sender.key_down(names[code])
+                    held_keys.add(names[code])
+                elif kind == EV_KEY_UP:
+                    sender.key_up(names[code])
+                    held_keys.discard(names[code])
+                elif kind == EV_MOVE:
+                    sender.move_to(x, y)
+                elif kind == EV_MOUSE_DOWN:
+                    sender.mouse_down(names[code])
+                    held_buttons.add(names[code])
+                elif kind == EV_MOUSE_UP:
+                    sender.mouse_up(names[code])
+                    held_buttons.discard(names[code])
+                elif kind == EV_SCROLL and can_scroll:
+                    sender.scroll(x)
+                else:
+                    continue
+                sent += 1
+        except KeyboardInterrupt:
+            print("\nStopped early (Ctrl+C).", flush=True)
+        finally:
+            del records  # drop the iterator's buffer export before closing the map
+            view.release()
+            for key in held_keys:
+                sender.key_up(key)
+            for button in held_buttons:
+                sender.mouse_up(button)
+            _release_backend(sender, backend)
+
+    return sent
+
+
+# Event log (.sklog): a fixed-size file of LOG_HEADER followed by `capacity`
+# LOG_RECORD slots used as a ring. `written` counts every record ever written,
+# so record n lives in slot n % capacity. Timestamps are seconds since `started`.
+LOG_MAGIC = b"SKLG"
+LOG_VERSION = 2  # 2: job id uint32 and action count uint64, so daemons and multi-day runs cannot overflow them
+LOG_HEADER = struct.Struct("<4sHHIQd")  # magic, version, record size, capacity, written, started (epoch)
+LOG_WRITTEN = struct.Struct("<Q")
+LOG_WRITTEN_OFFSET = 12
+LOG_RECORD = struct.Struct("<dBBxxIffQ")  # time, action, focus state, job id, lateness s, call s, actions
+LOG_PRESS, LOG_CLICK, LOG_DOWN, LOG_UP, LOG_STEP, LOG_MISS, LOG_START, LOG_STOP, LOG_ERROR = range(1, 10)
+LOG_ACTIONS = ("?", "press", "click", "down", "up", "step", "miss", "start", "stop", "error")
+DEFAULT_LOG_CAPACITY = 65536  # records (2 MiB)
+
+
+class EventLog:
+    """Bounded binary event log for long unattended runs, readable from another process.
+
+    The file is created at its final size and memory-mapped; write() packs one
+    record into its ring slot with struct.pack_into and then bumps the header
+    counter, so logging allocates no buffers and the file never grows. Only one
+    thread may write (the spam loop or the engine's dispatcher).
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_LOG_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("log capacity must be >= 1")
+        self.path = path
+        self.capacity = capacity
+        self.written = 0
+        size = LOG_HEADER.size + capacity * LOG_RECORD.size
+        with open(path, "w+b") as fh:
+            fh.truncate(size)
+            self._mm = mmap.mmap(fh.fileno(), size)
+        self._base = time.perf_counter()
+        LOG_HEADER.pack_into(self._mm, 0, LOG_MAGIC, LOG_VERSION, LOG_RECORD.size, capacity, 0, time.time())
+        self._pack = LOG_RECORD.pack_into
+        self._pack_written = LOG_WRITTEN.pack_into
+
+    def write(
+        self,
+        action: int,
+        lateness: float = 0.0,
+        call: float = 0.0,
+        focus: int = FOCUS_UNTRACKED,
+        job: int = 0,
+        actions: int = 1,
+    ) -> None:
+        n = self.written
+        offset = LOG_HEADER.size + n % self.capacity * LOG_RECORD.size
+        self._pack(self._mm, offset, time.perf_counter() - self._base, action, focus, job, lateness, call, actions)
+        self.written = n + 1
+        self._pack_written(self._mm, LOG_WRITTEN_OFFSET, n + 1)  # publish after the record is complete
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self._mm.flush()
+            self._mm.close()
+
+
+def read_log(path: str, since: int = 0) -> tuple[dict, list[tuple]]:
+    """Read the records of an event log that are still in the ring, oldest first.
+
+    Safe while another process writes: records overwritten during the copy are
+    dropped. `since` skips records numbered below it. Each record is
+    (number, time, action, focus, job, lateness, call, actions).
+    """
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, record_size, capacity, written, started = LOG_HEADER.unpack_from(mm, 0)
+        if magic != LOG_MAGIC:
+            raise ValueError(f"{path} is not a spam_key event log")
+        if version != LOG_VERSION or record_size != LOG_RECORD.size:
+            raise ValueError(f"{path} is a version {version} event log; this reader needs version {LOG_VERSION}")
+        first = max(since, written - capacity)
+        rows = [
+            (n, *LOG_RECORD.unpack_from(mm, LOG_HEADER.size + n % capacity * LOG_RECORD.size))
+            for n in range(first, written)
+        ]
+        # The writer may have lapped the oldest slots while we copied them.
+        (now_written,) = LOG_WRITTEN.unpack_from(mm, LOG_WRITTEN_OFFSET)
+    # Record now_written - capacity shares a slot with record now_written, which
+    # may be half-packed right now (the counter is bumped after the write).
+    oldest_intact = now_written - capacity + 1
+    rows = [row for row in rows if row[0] >= oldest_intact]
+    return {"capacity": capacity, "written": now_written, "started": started}, rows
+
+
+def format_log_record(row: tuple, started: float) -> str:
+    n, at, action, focus, job, lateness, call, actions = row
+    when = started + at
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(when)) + f".{int(when % 1 * 1000):03d}"
+    name = LOG_ACTIONS[action] if action < len(LOG_ACTIONS) else str(action)
+    text = f"{n:>10} {stamp} job {job:<3} {name:<6} x{actions:<4} late {lateness * 1000:8.3f} ms call {call * 1000:7.3f} ms"
+    return text + (f" focus {FOCUS_STATES[focus]}" if focus else "")
+
+
+def summarize_log(info: dict, rows: list[tuple]) -> dict:
+    """Counts per action, lateness percentiles, focus trouble and the longest gap between records."""
+    counts: dict[str, int] = {}
+    for row in rows:
+        name = LOG_ACTIONS[row[2]] if row[2] < len(LOG_ACTIONS) else str(row[2])
+        counts[name] = counts.get(name, 0) + 1
+    lateness = sorted(row[5] for row in rows if row[2] in (LOG_PRESS, LOG_CLICK, LOG_DOWN, LOG_STEP))
+    gap, gap_at = 0.0, None
+    for before, after in zip(rows, rows[1:]):
+        if after[1] - before[1] > gap:
+            gap, gap_at = after[1] - before[1], before[1]
+    return {
+        "written": info["written"],
+        "in_ring": len(rows),
+        "actions": counts,
+        "lateness_p50_ms": _percentile(lateness, 50) * 1000,
+        "lateness_p99_ms": _percentile(lateness, 99) * 1000,
+        "lateness_max_ms": lateness[-1] * 1000 if lateness else 0.0,
+        "focus_activations": sum(1 for row in rows if row[3] == FOCUS_ACTIVATED),
+        "focus_missing": sum(1 for row in rows if row[3] == FOCUS_MISSING),
+        "longest_gap_s": gap,
+        "longest_gap_at": info["started"] + gap_at if gap_at is not None else None,
+        "last_record_age_s": time.time() - (info["started"] + rows[-1][1]) if rows else None,
+    }
+
+
+def print_log_summary(summary: dict) -> None:
+    print(f"Records: {summary['written']} written, {summary['in_ring']} still in the ring")
+    print("Actions: " + (", ".join(f"{name} {count}" for name, count in summary["actions"].items()) or "none"))
+    print(
+        f"Lateness: p50 {summary['lateness_p50_ms']:.3f} ms, p99 {summary['lateness_p99_ms']:.3f} ms, "
+        f"max {summary['lateness_max_ms']:.3f} ms"
+    )
+    print(f"Focus: {summary['focus_activations']} re-activations, {summary['focus_missing']} checks without the window")
+    if summary["longest_gap_at"] is not None:
+        at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(summary["longest_gap_at"]))
+        print(f"Longest gap between records: {summary['longest_gap_s']:.3f} s after {at}")
+    if summary["last_record_age_s"] is not None:
+        print(f"Last record: {summary['last_record_age_s']:.1f} s ago")
+
+
+def tail_log(path: str, lines: int = 20, follow: bool = False, poll: float = 0.2) -> None:
+    """Print the last `lines` records, then (with `follow`) new ones as they arrive until Ctrl+C."""
+    info, rows = read_log(path)
+    for row in rows[-lines:] if lines else []:
+        print(format_log_record(row, info["started"]))
+    seen = info["written"]
+    try:
+        while follow:
+            time.sleep(poll)
+            info, rows = read_log(path, since=seen)
+            if info["written"] < seen:
+                print("... log was recreated")
+                seen = 0
+                continue
+            if rows and rows[0][0] > seen:
+                print(f"... {rows[0][0] - seen} records overwritten before they could be read")
+            for row in rows:
+                print(format_log_record(row, info["started"]), flush=True)
+            seen = info["written"]
+    except KeyboardInterrupt:
+        pass
+
+
+class Job:
+    """A repeating key press or mouse click run by a JobEngine.
+
+    A key target may be a chord such as "ctrl+c": keys go down in order and come
+    up in reverse. `count` and `state` are updated by the engine's dispatcher
+    thread; `stop()` and `done.wait()` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        target: str,
+        interval: float,
+        duration: float = 0,
+        start_delay: float = 0,
+        hold: float = 0,
+        target_window: str | None = None,
+        force_focus: bool = False,
+        backend: str | Backend = "pyautogui",
+        catch_up: str = "skip",
+        timing: TimingRecorder | None = None,
+        batch: int = 1,
+        when: ScreenCondition | None = None,
+        check_rate: float = DEFAULT_CHECK_RATE,
+        log: EventLog | None = None,
+        jitter: Jitter | None = None,
+        hold_jitter: Jitter | None = None,
+    ) -> None:
+        if mode not in ("key", "click"):
+            raise ValueError("mode must be 'key' or 'click'")
+        if not target:
+            raise ValueError("key cannot be empty" if mode == "key" else "mouse button cannot be empty")
+        _validate_run(interval, duration, start_delay, hold, catch_up, target_window, batch)
+
+        self.mode = mode
+        self.target = target
+        self.keys = chord_keys(target) if mode == "key" else (target,)
+        self.interval = interval
+        self.duration = duration
+        self.start_delay = start_delay
+        self.hold = hold
+        self.target_window = target_window
+        self.force_focus = force_focus
+        self.backend = backend
+        self.catch_up = catch_up
+        self.timing = timing
+        self.batch = batch
+        self.when = when
+        self.check_rate = check_rate
+        self.log = log  # shared logs are fine: only the dispatcher thread writes
+        self.jitter = jitter
+        self.hold_jitter = hold_jitter
+        if hold_jitter:
+            if batch > 1:
+                raise ValueError("batch > 1 only works with taps (no hold jitter)")
+            self.hold = hold_jitter.mean  # nominal; each press draws its own
+
+        self.id = 0
+        self.count = 0
+        self.started: float | None = None  # perf_counter of the first action
+        self.state = "pending"  # pending -> running -> finished | stopped | error
+        self.error: str | None = None
+        self.done = threading.Event()
+
+        self._engine: JobEngine | None = None
+        self._sender: Backend | None = None
+        self.focus: FocusTracker | None = None
+        self.watcher: ScreenWatcher | None = None
+        self.misses = 0  # deadlines skipped because the screen did not match
+        self._scheduler: DeadlineScheduler | None = None
+        self._held = 0  # holds in flight; the input goes up when the last one ends
+        self._ending = False  # schedule exhausted, waiting for those holds
+
+    def describe(self) -> str:
+        what = "presses" if self.mode == "key" else "clicks"
+        text = f"#{self.id} {self.mode} '{self.target}' every {self.interval}s: {self.count} {what} ({self.state})"
+        if self.focus and self.force_focus:
+            text += f", {self.focus.activations} focus activations"
+        if self.watcher:
+            text += f", {self.misses} skipped while the screen did not match"
+        return text
+
+    def stop(self) -> None:
+        if self._engine:
+            self._engine.stop(self)
+
+    def _send_down(self) -> None:
+        for key in self.keys:
+            if self.mode == "key":
+                self._sender.key_down(key)
+            else:
+                self._sender.mouse_down(key)
+
+    def _send_up(self) -> None:
+        for key in reversed(self.keys):
+            if self.mode == "key":
+                self._sender.key_up(key)
+            else:
+                self._sender.mouse_up(key)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "target": self.target,
+            "interval": self.interval,
+            "hold": self.hold,
+            "batch": self.batch,
+            "duration": self.duration,
+            "state": self.state,
+            "count": self.count,
+            "misses": self.misses,
+            "error": self.error,
+        }
+
+
+class JobEngine:
+    """Run any number of Jobs from one dispatcher thread.
+
+    Every pending action lives in a single heap of (deadline, seq, job, hold)
+    entries. The dispatcher sleeps until the earliest deadline (spinning for the
+    last stretch like _wait_until), fires it, and pushes the job's next deadline,
+    so jobs keep independent schedules without a thread each. A held press pushes
+    its release as its own entry (`hold` carries the press timestamps and length), so the next
+    press stays on the job's interval and holds of any length can overlap.
+    """
+
+    def __init__(self, on_finish: Callable[[Job], None] | None = None) -> None:
+        self.on_finish = on_finish
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, Job, tuple[float, float, float] | None]] = []
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._jobs: dict[int, Job] = {}
+        self._stopping: list[tuple[Job, str]] = []  # finished outside the lock by the dispatcher
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def add(self, job: Job) -> Job:
+        """Schedule `job` (after its start delay) and return it with its id assigned."""
+        if job.target_window:
+            job.focus = FocusTracker(job.target_window)
+        if job.when:
+            job.watcher = ScreenWatcher(job.when, job.check_rate)
+            job.watcher.start()
+        try:
+            job._sender = get_backend(job.backend)
+        except Exception:
+            if job.watcher:
+                job.watcher.stop()
+            raise
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Job engine has been shut down.")
+            job.id = next(self._ids)
+            job._engine = self
+            start = time.perf_counter() + job.start_delay
+            end_at = None if job.duration == 0 else start + job.duration
+            job._scheduler = DeadlineScheduler(job.interval, end_at, job.catch_up, start, job.jitter)
+            self._jobs[job.id] = job
+            self._push(job._scheduler.next_deadline(), job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="spam-dispatcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: int) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        return list(self._jobs.values())
+
+    def active_jobs(self) -> list[Job]:
+        return [job for job in self._jobs.values() if not job.done.is_set()]
+
+    def forget_finished(self) -> None:
+        """Drop finished jobs from the listing."""
+        with self._cond:
+            for job_id in [i for i, job in self._jobs.items() if job.done.is_set()]:
+                del self._jobs[job_id]
+
+    def stop(self, job: Job | int) -> None:
+        """Ask the dispatcher to stop one job; any held key/button is released."""
+        if isinstance(job, int):
+            job = self._jobs[job]
+        with self._cond:
+            self._stopping.append((job, "stopped"))
+            self._cond.notify()
+
+    def stop_all(self) -> None:
+        with self._cond:
+            self._stopping.extend((job, "stopped") for job in self.active_jobs())
+            self._cond.notify()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until every job has finished. Returns False on timeout."""
+        end = None if timeout is None else time.perf_counter() + timeout
+        for job in self.jobs():
+            remaining = None if end is None else max(0.0, end - time.perf_counter())
+            if not job.done.wait(remaining):
+                return False
+        return True
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stop every job and end the dispatcher thread, waiting at most `timeout` for it."""
+        with self._cond:
+            self._stopping.extend((job, "stopped") for job in self.active_jobs())
+            self._closed = True
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _push(self, deadline: float | None, job: Job, hold: tuple[float, float, float] | None = None) -> None:
+        # Called with _cond held, so finishing (which joins threads) is left to the dispatcher loop.
+        if deadline is None:
+            if job._held:
+                job._ending = True  # the last release finishes the job
+            else:
+                self._stopping.append((job, "finished"))
+        else:
+            heapq.heappush(self._heap, (deadline, next(self._seq), job, hold))
+
+    def _run(self) -> None:
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    stopping, self._stopping = self._stopping, []
+                    if stopping:
+                        break
+                    if self._closed:
+                        return
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    remaining = self._heap[0][0] - time.perf_counter()
+                    if remaining > SPIN_THRESHOLD:
+                        # Woken early by add()/stop() or the timeout; re-check the heap either way.
+                        self._cond.wait(remaining - SPIN_THRESHOLD)
+                        continue
+                    entry = heapq.heappop(self._heap)
+                    break
+            for job, state in stopping:
+                self._finish(job, state)
+            if entry is None:
+                continue
+            deadline, _, job, hold = entry
+            if job.done.is_set():
+                continue  # stale entry of a stopped job
+            _wait_until(deadline, None)
+            try:
+                self._fire(job, deadline, hold)
+            except Exception as exc:  # surfaced through job.error
+                job.error = str(exc)
+                self._finish(job, "error")
+
+    def _fire(self, job: Job, deadline: float, hold: tuple[float, float, float] | None) -> None:
+        sender = job._sender
+        log = job.log
+        focus_state = job.focus.state if job.focus and job.force_focus else FOCUS_UNTRACKED
+        if hold is not None:
+            began = time.perf_counter()
+            if job._held == 1:  # overlapping holds keep the input down until the last one ends
+                job._send_up()
+            job._held -= 1
+            job.count += 1
+            if job.timing:
+                down_sent, down_done, length = hold
+                held = time.perf_counter() - down_done
+                job.timing.record(deadline - length, down_sent, down_done - down_sent, held - length)
+            if log:
+                log.write(LOG_UP, began - deadline, time.perf_counter() - began, focus_state, job.id)
+            if job._ending and not job._held:
+                self._finish(job, "finished")
+            return
+
+        if job.state == "pending":
+            job.started = time.perf_counter()
+            job.state = "running"
+            if log:
+                log.write(LOG_START, job=job.id)
+        watcher = job.watcher
+        if watcher and not watcher.matched:
+            if watcher.error:
+                raise RuntimeError(f"Screen check failed: {watcher.error}")
+            job.misses += 1
+            if log:
+                log.write(LOG_MISS, focus=focus_state, job=job.id)
+            with self._cond:
+                self._push(job._scheduler.next_deadline(), job)
+            return
+        if job.mode == "key" and job.focus and job.force_focus:
+            job.focus.ensure()
+            focus_state = job.focus.state
+        sent = time.perf_counter()
+        if job.hold > 0:
+            job._held += 1  # count first so a failing call still gets released
+            job._send_down()
+            if log:
+                log.write(LOG_DOWN, sent - deadline, time.perf_counter() - sent, focus_state, job.id)
+            length = job.hold_jitter.next() if job.hold_jitter else job.hold
+            with self._cond:
+                # Release before a press due at the same instant (hold == interval).
+                self._push(deadline + length, job, (sent, time.perf_counter(), length))
+                self._push(job._scheduler.next_deadline(), job)
+            return
+
+        if len(job.keys) > 1:
+            for _ in range(job.batch):
+                job._send_down()
+                job._send_up()
+        elif job.batch > 1:
+            if job.mode == "key":
+                sender.press_many(job.target, job.batch)
+            else:
+                sender.click_many(job.target, job.batch)
+        elif job.mode == "key":
+            sender.press(job.target)
+        else:
+            sender.click(job.target)
+        if job.timing:
+            job.timing.record(deadline, sent, time.perf_counter() - sent, 0.0, job.batch)
+        if log:
+            action = LOG_PRESS if job.mode == "key" else LOG_CLICK
+            log.write(action, sent - deadline, time.perf_counter() - sent, focus_state, job.id, job.batch)
+        if job.mode == "click" and job.focus and job.force_focus:
+            job.focus.ensure()
+        job.count += job.batch
+        with self._cond:
+            self._push(job._scheduler.next_deadline(), job)
+
+    def _finish(self, job: Job, state: str) -> None:
+        """Clean up after `job` and mark it done. Never raises and never holds _cond.
+
+        Each cleanup step is tried on its own; the first failure is kept in
+        `job.error`, and `done` is set whatever happens so waiters never hang.
+        """
+        if job.done.is_set():
+            return
+
+        def attempt(step: Callable[..., object], *args: object) -> None:
+            try:
+                step(*args)
+            except Exception as exc:
+                if not job.error:
+                    job.error = str(exc)
+
+        if job._held:
+            attempt(job._send_up)
+            job._held = 0
+        if job.watcher:
+            attempt(job.watcher.stop)
+        attempt(_release_backend, job._sender, job.backend)
+        if job.log:
+            action = LOG_ERROR if state == "error" else LOG_STOP
+            attempt(lambda: job.log.write(action, job=job.id, actions=job.count))
+        job.state = state
+        job.done.set()
+        if self.on_finish:
+            attempt(self.on_finish, job)
+
+
+_JOB_OPTIONS: dict[str, tuple[str, Callable[[str], object]]] = {
+    "hold": ("hold", float),
+    "duration": ("duration", float),
+    "delay": ("start_delay", float),
+    "backend": ("backend", str),
+    "window": ("target_window", str),
+    "focus": ("force_focus", lambda v: v.lower() in ("1", "true", "yes", "on")),
+    "catch_up": ("catch_up", str),
+    "batch": ("batch", int),
+    "window_id": ("backend", lambda v: f"xsend:{v}"),
+}
+
+
+def parse_job_spec(spec: str, **defaults: object) -> Job:
+    """Build a Job from ``MODE:TARGET@INTERVAL[,option=value...]``.
+
+    Examples: ``key:a@0.1``, ``click:left@1,hold=0.05,duration=30``. Options are
+    hold, duration, delay, backend, window, focus, catch_up, batch and window_id
+    (X11 window to post to via the xsend backend); anything not given falls back
+    to `defaults` (Job keyword arguments).
+    """
+    body, sep, tail = spec.rpartition("@")
+    mode, colon, target = body.partition(":")
+    if not sep or not colon:
+        raise ValueError(f"Invalid job '{spec}'. Expected MODE:TARGET@INTERVAL, e.g. key:a@0.1")
+    interval_text, *options = tail.split(",")
+    kwargs = dict(defaults)
+    for option in options:
+        name, eq, value = option.partition("=")
+        if not eq or name.strip() not in _JOB_OPTIONS:
+            raise ValueError(f"Invalid job option '{option}'. Known options: {', '.join(_JOB_OPTIONS)}")
+        field, convert = _JOB_OPTIONS[name.strip()]
+        kwargs[field] = convert(value.strip())
+    return Job(mode.strip(), target, float(interval_text), **kwargs)  # type: ignore[arg-type]
+
+
+def job_from_dict(spec: dict, **defaults: object) -> Job:
+    """Build a Job from an object with mode, target, interval and the parse_job_spec options.
+
+    Values go through the same conversions as the text form, so a JSON client
+    cannot hand the Job anything a --job spec could not.
+    """
+    unknown = sorted(set(spec) - {"mode", "target", "interval", *_JOB_OPTIONS})
+    if unknown:
+        raise ValueError(
+            f"Unknown job field(s) {', '.join(unknown)}. Known: mode, target, interval, {', '.join(_JOB_OPTIONS)}"
+        )
+    missing = [name for name in ("mode", "target", "interval") if name not in spec]
+    if missing:
+        raise ValueError(f"Job object needs {', '.join(missing)}")
+    kwargs = dict(defaults)
+    for name, value in spec.items():
+        if name in _JOB_OPTIONS:
+            field, convert = _JOB_OPTIONS[name]
+            kwargs[field] = convert(str(value))
+    return Job(str(spec["mode"]), str(spec["target"]), float(str(spec["interval"])), **kwargs)  # type: ignore[arg-type]
+
+
+def run_jobs(jobs: list[Job]) -> None:
+    """Run `jobs` together on one JobEngine until all finish or Ctrl+C."""
+    engine = JobEngine()
+    try:
+        for job in jobs:
+            engine.add(job)
+    except Exception:
+        engine.shutdown()  # release jobs already started before reporting the bad one
+        raise
+    try:
+        # Poll so Ctrl+C is delivered promptly on every platform.
+        while not engine.wait(0.2):
+            pass
+    except KeyboardInterrupt:
+        print("\nStopped early (Ctrl+C).", flush=True)
+    engine.shutdown()
+    for job in jobs:
+        line = job.describe()
+        print(f"{line}: {job.error}" if job.error else line)
+        if job.timing:
+            print(f"  timing: {format_timing(job.timing)}")
+
+
+def default_socket_path() -> str:
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(base, f"spam_key-{user}.sock")
+
+
+class ControlDaemon:
+    """Resident job server: one warm JobEngine behind a Unix socket.
+
+    Clients send one JSON object per line and get one JSON line back::
+
+        {"cmd": "start", "job": "key:a@0.05,duration=2"}  -> {"ok": true, "job": {...}}
+        {"cmd": "stop", "id": 1}   (omit "id" to stop every job)
+        {"cmd": "status", "id": 1}
+        {"cmd": "list"}
+        {"cmd": "shutdown"}
+
+    "job" is a --job spec or an object of its fields (see job_from_dict). Backends are built
+    once at startup and shared by every job, so a start pays no import cost.
+    """
 
-# Optional: keyboard allows global hotkeys for start/stop.
-try:  # pragma: no cover - optional dependency
-    import keyboard  # type: ignore
-    HAS_KEYBOARD = True
-except ImportError:  # pragma: no cover - optional dependency
-    HAS_KEYBOARD = False
+    MAX_JOBS = 1000
 
-# Optional: pygetwindow lets us activate a specific window by title (Windows/macOS/X11).
-try:  # pragma: no cover - optional dependency
-    import pygetwindow as gw  # type: ignore
-    HAS_GW = True
-except ImportError:  # pragma: no cover - optional dependency
-    HAS_GW = False
+    def __init__(self, socket_path: str, warm: list[str], job_defaults: dict) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Daemon mode needs Unix domain sockets, which this platform does not provide.")
+        self.socket_path = socket_path
+        self.job_defaults = job_defaults
+        self.engine = JobEngine()
+        self.backends = {name: get_backend(name) for name in warm}
+        self._server = None
+        self._shutdown_requested = False
 
+    def handle(self, request: dict) -> dict:
+        cmd = request.get("cmd")
+        if cmd == "start":
+            spec = request.get("job")
+            if isinstance(spec, str):
+                job = parse_job_spec(spec, **self.job_defaults)
+            elif isinstance(spec, dict):
+                job = job_from_dict(spec, **self.job_defaults)
+            else:
+                raise ValueError("start needs 'job': a job spec string or an object of job fields")
+            if isinstance(job.backend, str):
+                if job.backend not in self.backends:
+                    self.backends[job.backend] = get_backend(job.backend)
+                job.backend = self.backends[job.backend]
+            if len(self.engine.jobs()) >= self.MAX_JOBS:
+                self.engine.forget_finished()  # keep a resident daemon's job table bounded
+            return {"job": self.engine.add(job).to_dict()}
+        if cmd == "stop":
+            if "id" in request:
+                self._job(request["id"]).stop()
+            else:
+                self.engine.stop_all()
+            return {}
+        if cmd == "status":
+            return {"job": self._job(request.get("id")).to_dict()}
+        if cmd == "list":
+            return {"jobs": [job.to_dict() for job in self.engine.jobs()]}
+        if cmd == "ping":
+            return {}
+        if cmd == "shutdown":
+            self._shutdown_requested = True  # acted on once the reply is written
+            return {}
+        raise ValueError(f"Unknown command {cmd!r}")
 
-def _wait_with_cancel(seconds: float, stop_event: threading.Event | None) -> None:
-    """Sleep for `seconds` but respond quickly to stop requests."""
-    if seconds <= 0:
-        return
-    end = time.monotonic() + seconds
-    while time.monotonic() < end:
-        if stop_event and stop_event.is_set():
-            return
-        time.sleep(0.05)
+    def _job(self, job_id: object) -> Job:
+        job = self.engine.get(job_id) if isinstance(job_id, int) else None
+        if job is None:
+            raise ValueError(f"No job with id {job_id!r}")
+        return job
 
+    def serve_forever(self) -> None:
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        reply = {"ok": True, **daemon.handle(json.loads(line))}
+                    except Exception as exc:  # reported to the client, daemon keeps running
+                        reply = {"ok": False, "error": str(exc)}
+                    self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+                    if daemon._shutdown_requested:
+                        threading.Thread(target=daemon._server.shutdown, daemon=True).start()
+                        return
+
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # stale socket from a previous run
+            else:
+                raise RuntimeError(f"Another daemon is already listening on {self.socket_path}.")
+            finally:
+                probe.close()
+        old_umask = os.umask(0o177)  # socket is created owner-only, no window before a chmod
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.engine.shutdown()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def send_command(request: dict, socket_path: str, timeout: float = 5.0) -> dict:
+    """Send one command to a running daemon and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+
+def client_request(words: list[str]) -> dict:
+    """Turn `--send start key:a@0.1` / `--send stop 3` / `--send list` into a request."""
+    cmd, *rest = words
+    request: dict = {"cmd": cmd}
+    if cmd == "start":
+        if len(rest) != 1:
+            raise ValueError("usage: --send start SPEC")
+        request["job"] = rest[0]
+    elif cmd in ("stop", "status") and rest:
+        request["id"] = int(rest[0])
+    return request
 
-def spam_key(
-    key: str,
-    interval: float,
-    duration: float,
-    start_delay: float,
-    hold: float,
-    target_window: str | None,
-    force_focus: bool,
-    stop_event: threading.Event | None = None,
-    backend: str = "pyautogui",
-) -> int:
-    """Send key presses at a fixed interval for the given duration.
 
-    Returns the number of presses performed.
+BENCH_INTERVALS = (0.01, 0.005, 0.002, 0.001)
+BENCH_HOLDS = (0.0, 0.001)
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def benchmark_run(interval: float, hold: float, seconds: float) -> dict[str, float]:
+    """Run spam_key against the null backend for `seconds`, then stop it and measure.
+
+    Lateness is taken against the scheduled deadlines a TimingRecorder gets from
+    the run itself (press deadlines for holds too), with catch_up="burst" so
+    every missed deadline still shows up as a late press.
     """
-    if interval <= 0:
-        raise ValueError("interval must be > 0")
-    if duration < 0:
-        raise ValueError("duration must be >= 0")
-    if start_delay < 0:
-        raise ValueError("start_delay must be >= 0")
-    if hold < 0:
-        raise ValueError("hold must be >= 0")
-    if target_window and not HAS_GW:
-        raise RuntimeError("pygetwindow is required for target window. Install with: python -m pip install pygetwindow")
+    backend = NullBackend()
+    stop_event = threading.Event()
+    timing = TimingRecorder(int(seconds / interval) + 1024)  # room for every press of the run
+    worker = threading.Thread(
+        target=spam_key,
+        args=("a", interval, 0, 0, hold, None, False, stop_event, backend, "burst", None, timing),
+        daemon=True,
+    )
+    worker.start()
+    time.sleep(seconds)
+    stop_at = time.perf_counter()
+    stop_event.set()
+    worker.join()
+    stop_latency = time.perf_counter() - stop_at
 
-    # Choose which sender to use.
-    if backend == "pydirectinput":
-        if not HAS_PYDIRECT:
-            raise RuntimeError("pydirectinput is not installed. Install with: python -m pip install pydirectinput")
-        sender_down = lambda k: pydirectinput.keyDown(k)  # type: ignore[arg-type]
-        sender_up = lambda k: pydirectinput.keyUp(k)  # type: ignore[arg-type]
-        sender_press = lambda k: pydirectinput.press(k)  # type: ignore[arg-type]
-    else:
-        pyautogui.FAILSAFE = False
-        pyautogui.PAUSE = 0  # run as fast as the interval allows
-        sender_down = lambda k: pyautogui.keyDown(k)
-        sender_up = lambda k: pyautogui.keyUp(k)
-        sender_press = lambda k: pyautogui.press(k)
-
-    target = None
-    if target_window and HAS_GW:
-        matches = gw.getWindowsWithTitle(target_window)
-        if not matches:
-            raise RuntimeError(f"No window found with title containing '{target_window}'.")
-        target = matches[0]
+    rows = sorted(timing.rows(), key=lambda row: row[0])  # releases record out of press order
+    lateness = sorted(sent - scheduled for scheduled, sent, _, _ in rows)
+    starts = [sent for _, sent, _, _ in rows]
+    elapsed = starts[-1] - starts[0] if len(starts) > 1 else 0.0
+    return {
+        "interval": interval,
+        "hold": hold,
+        "actions": len(starts),
+        "target_rate": 1 / interval,
+        "achieved_rate": (len(starts) - 1) / elapsed if elapsed else 0.0,
+        "lateness_p50_ms": _percentile(lateness, 50) * 1000,
+        "lateness_p99_ms": _percentile(lateness, 99) * 1000,
+        "stop_latency_ms": stop_latency * 1000,
+    }
 
-    if start_delay:
-        _wait_with_cancel(start_delay, stop_event)
-        if stop_event and stop_event.is_set():
-            return 0
 
-    end_at = None if duration == 0 else time.monotonic() + duration
-    presses = 0
+def run_benchmark(
+    intervals: tuple[float, ...] = BENCH_INTERVALS,
+    holds: tuple[float, ...] = BENCH_HOLDS,
+    seconds: float = 1.0,
+) -> list[dict[str, float]]:
+    """Benchmark the scheduler over every interval/hold combination (headless)."""
+    return [benchmark_run(interval, hold, seconds) for interval in intervals for hold in holds]
 
-    try:
-        while True:
-            if stop_event and stop_event.is_set():
-                break
-            if end_at is not None and time.monotonic() >= end_at:
-                break
-            if target and force_focus:
-                try:
-                    target.activate()
-                except Exception:
-                    pass
-            if hold > 0:
-                sender_down(key)
-                _wait_with_cancel(hold, stop_event)
-                sender_up(key)
-            else:
-                sender_press(key)
-            presses += 1
-            _wait_with_cancel(interval, stop_event)
-    except KeyboardInterrupt:
-        print("\nStopped early (Ctrl+C).", flush=True)
 
-    return presses
+def benchmark_startup(runs: int = 5) -> list[dict[str, float]]:
+    """Time cold interpreter launches: importing this module, a short null-backend
+    CLI run, and importing each installed input dependency on its own."""
+    import subprocess  # only the benchmark needs it; keep it off the startup path
 
+    script = os.path.abspath(__file__)
+    cases = {
+        "import spam_key": [sys.executable, "-c", f"import sys; sys.path.insert(0, {os.path.dirname(script)!r}); import spam_key"],
+        "cli null run": [sys.executable, script, "--key", "a", "--backend", "null", "--start-delay", "0", "--duration", "0.01"],
+    }
+    for name in ("tkinter", "pyautogui", "pydirectinput", "keyboard", "pygetwindow"):
+        if _has_module(name):
+            cases[f"import {name}"] = [sys.executable, "-c", f"import {name}"]
+    results = []
+    for name, cmd in cases.items():
+        times = []
+        for _ in range(runs):
+            began = time.perf_counter()
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            times.append(time.perf_counter() - began)
+        times.sort()
+        results.append({"case": name, "min_ms": times[0] * 1000, "median_ms": times[len(times) // 2] * 1000})
+    return results
 
-def spam_click(
-    button: str,
-    interval: float,
-    duration: float,
-    start_delay: float,
-    hold: float,
-    target_window: str | None,
-    force_focus: bool,
-    stop_event: threading.Event | None = None,
-    backend: str = "pyautogui",
-) -> int:
-    """Spam mouse clicks at a fixed interval."""
-    if interval <= 0:
-        raise ValueError("interval must be > 0")
-    if duration < 0:
-        raise ValueError("duration must be >= 0")
-    if start_delay < 0:
-        raise ValueError("start_delay must be >= 0")
-    if hold < 0:
-        raise ValueError("hold must be >= 0")
-    if target_window and not HAS_GW:
-        raise RuntimeError("pygetwindow is required for target window. Install with: python -m pip install pygetwindow")
 
-    if backend == "pydirectinput":
-        if not HAS_PYDIRECT:
-            raise RuntimeError("pydirectinput is not installed. Install with: python -m pip install pydirectinput")
-        click_down = lambda b: pydirectinput.mouseDown(button=b)  # type: ignore[arg-type]
-        click_up = lambda b: pydirectinput.mouseUp(button=b)  # type: ignore[arg-type]
-        click_once = lambda b: pydirectinput.click(button=b)  # type: ignore[arg-type]
-    else:
-        pyautogui.FAILSAFE = False
-        pyautogui.PAUSE = 0
-        click_down = lambda b: pyautogui.mouseDown(button=b)
-        click_up = lambda b: pyautogui.mouseUp(button=b)
-        click_once = lambda b: pyautogui.click(button=b)
-
-    target = None
-    if target_window and HAS_GW:
-        matches = gw.getWindowsWithTitle(target_window)
-        if not matches:
-            raise RuntimeError(f"No window found with title containing '{target_window}'.")
-        target = matches[0]
+def benchmark_match(size: int = 64, template_size: int = 12, runs: int = 200) -> list[dict[str, float]]:
+    """Time ScreenCondition matching on a synthetic `size` x `size` frame against
+    a plain per-pixel Python check, so no screen or display is needed."""
+    np = _require("numpy")
+    frame = np.random.default_rng(0).integers(0, 256, (size, size, 3), dtype=np.uint8)
+    at = size - template_size - 1  # near the far corner: the worst case for a scan
+    template = frame[at : at + template_size, at : at + template_size].copy()
+    region = (0, 0, size, size)
+    color = tuple(int(v) for v in frame[size - 1, size - 1])
+    pixel = ScreenCondition(region, color=color, tolerance=0)
+    image = ScreenCondition(region, template=template, tolerance=0)
+    rows, tpl = frame.tolist(), template.tolist()
 
-    if start_delay:
-        _wait_with_cancel(start_delay, stop_event)
-        if stop_event and stop_event.is_set():
-            return 0
+    def python_pixel() -> bool:
+        return any(all(abs(c - t) <= 0 for c, t in zip(px, color)) for row in rows for px in row)
 
-    end_at = None if duration == 0 else time.monotonic() + duration
-    clicks = 0
+    def python_template() -> bool:
+        for y in range(size - template_size + 1):
+            for x in range(size - template_size + 1):
+                if all(
+                    rows[y + dy][x + dx] == tpl[dy][dx] for dy in range(template_size) for dx in range(template_size)
+                ):
+                    return True
+        return False
 
-    while True:
-        if stop_event and stop_event.is_set():
-            break
-        if end_at is not None and time.monotonic() >= end_at:
-            break
-        if hold > 0:
-            click_down(button)
-            _wait_with_cancel(hold, stop_event)
-            click_up(button)
+    cases = [
+        ("pixel numpy", lambda: pixel.matches(frame), runs),
+        ("pixel python", python_pixel, max(1, runs // 10)),
+        ("template numpy", lambda: image.matches(frame), max(1, runs // 10)),
+        ("template python", python_template, 3),
+    ]
+    results = []
+    for name, check, count in cases:
+        assert check(), name  # both implementations must find the planted match
+        times = []
+        for _ in range(count):
+            began = time.perf_counter()
+            check()
+            times.append(time.perf_counter() - began)
+        times.sort()
+        results.append({"case": name, "min_ms": times[0] * 1000, "median_ms": times[len(times) // 2] * 1000})
+    return results
+
+
+def print_match_benchmark(results: list[dict[str, float]]) -> None:
+    print(f"{'case':<18} {'min ms':>9} {'median ms':>10}")
+    for r in results:
+        print(f"{r['case']:<18} {r['min_ms']:>9.3f} {r['median_ms']:>10.3f}")
+
+
+def print_startup_benchmark(results: list[dict[str, float]]) -> None:
+    print(f"{'case':<22} {'min ms':>9} {'median ms':>10}")
+    for r in results:
+        print(f"{r['case']:<22} {r['min_ms']:>9.1f} {r['median_ms']:>10.1f}")
+
+
+def print_benchmark(results: list[dict[str, float]]) -> None:
+    print(f"{'interval':>9} {'hold':>7} {'target/s':>9} {'got/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'stop ms':>8}")
+    for r in results:
+        print(
+            f"{r['interval']:>9.4f} {r['hold']:>7.4f} {r['target_rate']:>9.1f} {r['achieved_rate']:>9.1f} "
+            f"{r['lateness_p50_ms']:>8.3f} {r['lateness_p99_ms']:>8.3f} {r['stop_latency_ms']:>8.3f}"
+        )
+
+
+PROGRESS_FPS = 10  # status line refreshes per second while jobs run
+
+
+class HotkeyHook:
+    """Global hotkey on a raw keyboard.hook that ignores the keys we inject ourselves.
+
+    keyboard.add_hotkey runs its matching for every key event, our own output
+    included, and a spammed key equal to the hotkey would toggle the run. Here
+    each event is first checked against INJECTED (one dict lookup) and dropped if
+    it is ours; only real input reaches the hand-rolled hotkey match. `latency`
+    records how long events took from capture to this callback.
+    """
+
+    def __init__(self, hotkey: str, callback: Callable[[], None]) -> None:
+        self.keys = frozenset(_key_alias(part) for part in hotkey.split("+") if part.strip())
+        if not self.keys:
+            raise ValueError("Hotkey not set")
+        self.callback = callback
+        self.events = 0
+        self.filtered = 0
+        self.latency = LatencyHistogram()
+        self._pressed: set[str] = set()
+        self._fired = False
+        self._keyboard = _require("keyboard")
+        self._handle = self._keyboard.hook(self._on_event)
+        INJECTED.enabled = True
+
+    def _on_event(self, event) -> None:
+        self.events += 1
+        self.latency.add(max(0.0, time.time() - event.time))
+        name = _key_alias(event.name or "")
+        down = event.event_type == "down"
+        if INJECTED.consume(name, down):
+            self.filtered += 1
+            return
+        in_hotkey = name in self.keys or _HOTKEY_SIDES.get(name) in self.keys
+        if down:
+            self._pressed.add(name)
+            # Fire once per press of the combination, not on key repeat.
+            if not self._fired and in_hotkey and self.keys <= self._held():
+                self._fired = True
+                self.callback()
         else:
-            click_once(button)
-        if target and force_focus:
-            try:
-                target.activate()
-            except Exception:
-                pass
-        clicks += 1
-        _wait_with_cancel(interval, stop_event)
+            self._pressed.discard(name)
+            if in_hotkey:
+                self._fired = False
 
-    return clicks
+    def _held(self) -> set[str]:
+        return self._pressed | {_HOTKEY_SIDES[name] for name in self._pressed if name in _HOTKEY_SIDES}
+
+    def describe(self) -> str:
+        return f"hook p99 {self.latency.percentile(99) * 1000:.1f} ms, {self.filtered} own keys skipped"
+
+    def close(self) -> None:
+        INJECTED.enabled = False
+        try:
+            self._keyboard.unhook(self._handle)
+        except Exception:
+            pass
+
+
+class ProgressMeter:
+    """Turn Job counters into a live count, rate and elapsed time for a display.
+
+    The engine's dispatcher only bumps plain attributes (Job.count, Job.started)
+    and never calls into the UI; whoever displays progress calls sample() at its
+    own fixed rate. The rate is the count gained over the last `window` seconds
+    of samples, so it is smooth however bursty the jobs are.
+    """
+
+    def __init__(self, window: float = 1.0) -> None:
+        self.window = window
+        self.total = 0  # actions seen across every job sampled so far
+        self._last: dict[int, int] = {}
+        self._history: deque[tuple[float, int]] = deque()
+
+    def sample(self, jobs: list[Job]) -> tuple[int, float, float]:
+        """Return (count, rate per second, elapsed seconds) over the running `jobs`."""
+        now = time.perf_counter()
+        last, self._last = self._last, {}
+        for job in jobs:
+            count = job.count
+            self.total += count - last.get(job.id, 0)
+            self._last[job.id] = count
+        history = self._history
+        history.append((now, self.total))
+        while len(history) > 2 and now - history[1][0] >= self.window:
+            history.popleft()
+        then, before = history[0]
+        rate = (self.total - before) / (now - then) if now > then else 0.0
+        running = [job for job in jobs if job.started is not None and not job.done.is_set()]
+        count = sum(job.count for job in running)
+        elapsed = now - min(job.started for job in running) if running else 0.0
+        return count, rate, elapsed
+
+    def reset(self) -> None:
+        self._history.clear()
 
 
 class SpammerApp:
@@ -226,15 +3435,28 @@ class SpammerApp:
         self.backend_var = tk.StringVar(value="pyautogui")
         self.hotkey_var = tk.StringVar(value="k")
         self.status_var = tk.StringVar(value="Idle")
+        self.rate_hint_var = tk.StringVar(value="")
+        self.hook_stats_var = tk.StringVar(value="")
+        self.windows_status_var = tk.StringVar(value="")
 
-        self._thread: threading.Thread | None = None
-        self._stop_event: threading.Event | None = None
-        self._hotkey_registered = False
-        self._hotkey_handle = None
+        # Every run is a job on one shared engine, so several can run side by side.
+        # No after() once closing: the Tk thread is then blocked joining the dispatcher,
+        # and a cross-thread after() waits for it (threaded Tcl), deadlocking both.
+        self._closing = False
+        self._engine = JobEngine(on_finish=lambda job: self._closing or self.root.after(0, self._finish_job, job))
+        self._hotkey: HotkeyHook | None = None
+        self._windows_loading = False
+        self._live_polling = False
+        self._progress = ProgressMeter()
 
         self._build_ui()
-        self._register_hotkey()
+        # Importing `keyboard` and installing its hook can be slow; let the window paint first.
+        self.root.after_idle(self._register_hotkey)
         self.mode_var.trace_add("write", lambda *_: self._update_mode_fields())
+        self._calibration = load_calibration()
+        self.mode_var.trace_add("write", lambda *_: self._update_rate_hint())
+        self.backend_var.trace_add("write", lambda *_: self._update_rate_hint())
+        self._update_rate_hint()
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _build_ui(self) -> None:
@@ -256,7 +3478,10 @@ class SpammerApp:
         self.mouse_entry.grid(row=2, column=1, **padding)
 
         ttk.Label(frm, text="Interval seconds").grid(row=3, column=0, sticky="w", **padding)
-        ttk.Entry(frm, textvariable=self.interval_var, width=20).grid(row=3, column=1, **padding)
+        interval_row = ttk.Frame(frm)
+        interval_row.grid(row=3, column=1, sticky="w", **padding)
+        ttk.Entry(interval_row, textvariable=self.interval_var, width=10).grid(row=0, column=0, padx=(0, 6))
+        ttk.Label(interval_row, textvariable=self.rate_hint_var, foreground="gray").grid(row=0, column=1)
 
         ttk.Label(frm, text="Duration seconds (0 = until Stop)").grid(row=4, column=0, sticky="w", **padding)
         ttk.Entry(frm, textvariable=self.duration_var, width=20).grid(row=4, column=1, **padding)
@@ -271,7 +3496,7 @@ class SpammerApp:
         backend_box = ttk.Combobox(
             frm,
             textvariable=self.backend_var,
-            values=["pyautogui"] + (["pydirectinput"] if HAS_PYDIRECT else []),
+            values=available_backends(),
             state="readonly",
             width=17,
         )
@@ -283,6 +3508,7 @@ class SpammerApp:
         self.window_combo = ttk.Combobox(window_row, width=18, values=[])
         self.window_combo.grid(row=0, column=0, padx=(0, 6))
         ttk.Button(window_row, text="Refresh", command=self._refresh_windows).grid(row=0, column=1)
+        ttk.Label(frm, textvariable=self.windows_status_var, foreground="gray").grid(row=9, column=0, sticky="w", **padding)
         ttk.Entry(frm, textvariable=self.target_window_var, width=20).grid(row=9, column=1, **padding)
         ttk.Checkbutton(frm, text="Force focus each action", variable=self.force_focus_var).grid(
             row=10, column=0, columnspan=2, sticky="w", **padding
@@ -294,6 +3520,7 @@ class SpammerApp:
         hotkey_entry = ttk.Entry(hotkey_row, textvariable=self.hotkey_var, width=10)
         hotkey_entry.grid(row=0, column=0, padx=(0, 6))
         ttk.Button(hotkey_row, text="Apply", command=self._register_hotkey).grid(row=0, column=1)
+        ttk.Label(hotkey_row, textvariable=self.hook_stats_var, foreground="gray").grid(row=0, column=2, padx=(6, 0))
         if not HAS_KEYBOARD:
             ttk.Label(frm, text="Install 'keyboard' for hotkey", foreground="red").grid(row=12, column=0, columnspan=2, sticky="w", **padding)
 
@@ -304,16 +3531,25 @@ class SpammerApp:
         self.start_btn.grid(row=0, column=0, padx=6)
         self.stop_btn.grid(row=0, column=1, padx=6)
 
+        # Start again while running to add another job; each keeps its own schedule.
+        ttk.Label(frm, text="Jobs (Start adds one)").grid(row=14, column=0, columnspan=2, sticky="w", **padding)
+        self.jobs_list = tk.Listbox(frm, width=50, height=4)
+        self.jobs_list.grid(row=15, column=0, columnspan=2, **padding)
+        jobs_btns = ttk.Frame(frm)
+        jobs_btns.grid(row=16, column=0, columnspan=2, pady=(0, 6))
+        ttk.Button(jobs_btns, text="Stop selected", command=self.stop_selected_job).grid(row=0, column=0, padx=6)
+        ttk.Button(jobs_btns, text="Clear finished", command=self._clear_finished_jobs).grid(row=0, column=1, padx=6)
+
         # Built-in test pad: click inside, press Start, and you should see characters appear.
-        ttk.Label(frm, text="Test pad (click here, then Start)").grid(row=14, column=0, columnspan=2, sticky="w", **padding)
+        ttk.Label(frm, text="Test pad (click here, then Start)").grid(row=17, column=0, columnspan=2, sticky="w", **padding)
         self.test_pad = tk.Text(frm, width=38, height=4)
-        self.test_pad.grid(row=15, column=0, columnspan=2, **padding)
+        self.test_pad.grid(row=18, column=0, columnspan=2, **padding)
         ttk.Button(frm, text="Clear test pad", command=lambda: self.test_pad.delete("1.0", tk.END)).grid(
-            row=16, column=0, columnspan=2, pady=(0, 6)
+            row=19, column=0, columnspan=2, pady=(0, 6)
         )
 
         ttk.Label(frm, textvariable=self.status_var, foreground="blue").grid(
-            row=17, column=0, columnspan=2, sticky="w", **padding
+            row=20, column=0, columnspan=2, sticky="w", **padding
         )
 
         self._update_mode_fields()
@@ -328,26 +3564,50 @@ class SpammerApp:
             self.key_entry.config(state=tk.DISABLED)
             self.mouse_entry.config(state=tk.NORMAL)
 
+    def _update_rate_hint(self) -> None:
+        limit = rate_limit(self.backend_var.get(), self.mode_var.get(), self._calibration)
+        self.rate_hint_var.set(f"max ~{limit:.0f}/s (>= {1 / limit:.4f}s)" if limit else "max: run --calibrate")
+
     def _refresh_windows(self) -> None:
         if not HAS_GW:
             self.window_combo['values'] = []
             if not self.target_window_var.get():
                 self.target_window_var.set("Install pygetwindow for window list")
             return
-        titles = [t for t in gw.getAllTitles() if t.strip()]
+        if self._windows_loading:
+            return
+        # getAllTitles() can take a second on busy desktops; keep showing the last list meanwhile.
+        self._windows_loading = True
+        self.windows_status_var.set("Listing windows...")
+        threading.Thread(target=self._enumerate_windows, daemon=True).start()
+
+    def _enumerate_windows(self) -> None:
+        try:
+            titles = [t for t in _require("pygetwindow").getAllTitles() if t.strip()]
+            error = None
+        except Exception as exc:  # pragma: no cover - surfaced to UI
+            titles, error = None, f"Window list failed: {exc}"
+        try:
+            self.root.after(0, self._apply_windows, titles, error)
+        except Exception:  # pragma: no cover - window closed while enumerating
+            pass
+
+    def _apply_windows(self, titles: list[str] | None, error: str | None) -> None:
+        self._windows_loading = False
+        if titles is None:
+            self.windows_status_var.set(error or "")
+            return
         self.window_combo['values'] = titles
         if titles and not self.window_combo.get():
             self.window_combo.set(titles[0])
+        self.windows_status_var.set(f"Windows as of {time.strftime('%H:%M:%S')}")
 
     def _register_hotkey(self) -> None:
         # Remove previous hotkey if any
-        if self._hotkey_registered and self._hotkey_handle and HAS_KEYBOARD:
-            try:
-                keyboard.remove_hotkey(self._hotkey_handle)
-            except Exception:
-                pass
-            self._hotkey_registered = False
-            self._hotkey_handle = None
+        if self._hotkey:
+            self._hotkey.close()
+            self._hotkey = None
+            self.hook_stats_var.set("")
 
         hotkey = self.hotkey_var.get().strip()
         if not hotkey:
@@ -359,23 +3619,19 @@ class SpammerApp:
             return
 
         try:
-            self._hotkey_handle = keyboard.add_hotkey(hotkey, lambda: self.root.after(0, self._hotkey_toggle))
-            self._hotkey_registered = True
+            self._hotkey = HotkeyHook(hotkey, lambda: self.root.after(0, self._hotkey_toggle))
             self.status_var.set(f"Hotkey '{hotkey}' toggles start/stop")
         except Exception as exc:  # pragma: no cover - best effort
             self.status_var.set(f"Hotkey failed: {exc}")
 
     def _hotkey_toggle(self) -> None:
         # Toggle run state; ensure UI thread handles it
-        if self._thread and self._thread.is_alive():
+        if self._engine.active_jobs():
             self.stop_spam()
         else:
             self.start_spam()
 
     def start_spam(self) -> None:
-        if self._thread and self._thread.is_alive():
-            return
-
         mode = self.mode_var.get()
         key = self.key_var.get().strip()
         mouse_button = self.mouse_button_var.get().strip().lower()
@@ -407,75 +3663,99 @@ class SpammerApp:
             return
 
         backend = self.backend_var.get()
+        target = key if mode == "key" else mouse_button
 
-        self._stop_event = threading.Event()
-        self._thread = threading.Thread(
-            target=self._run_spammer,
-            args=(mode, key, mouse_button, interval, duration, start_delay, hold, target_window, force_focus, backend),
-            daemon=True,
-        )
-        self._thread.start()
+        try:
+            job = self._engine.add(
+                Job(
+                    mode, target, interval, duration, start_delay, hold, target_window, force_focus, backend,
+                    timing=TimingRecorder(),
+                )
+            )
+        except Exception as exc:  # pragma: no cover - surfaced to UI
+            self.status_var.set(f"Error: {exc}")
+            return
         self._set_running_state(True)
+        self._refresh_jobs()
         self.status_var.set(
             (
-                f"Running {mode}: '{key if mode=='key' else mouse_button}' every {interval}s for "
+                f"Running job #{job.id} {mode}: '{target}' every {interval}s for "
                 f"{'until Stop' if duration == 0 else duration}s via {backend}"
             )
         )
+        if not self._live_polling:
+            self._live_polling = True
+            self._progress.reset()
+            self.root.after(1000 // PROGRESS_FPS, self._show_progress)
 
-    def _run_spammer(
-        self,
-        mode: str,
-        key: str,
-        mouse_button: str,
-        interval: float,
-        duration: float,
-        start_delay: float,
-        hold: float,
-        target_window: str | None,
-        force_focus: bool,
-        backend: str,
-    ) -> None:
-        try:
-            if mode == "click":
-                presses = spam_click(
-                    mouse_button, interval, duration, start_delay, hold, target_window, force_focus, self._stop_event, backend
-                )
-                msg = f"Finished. Sent {presses} clicks of '{mouse_button}'." if not self._stop_event.is_set() else "Stopped."
-            else:
-                presses = spam_key(
-                    key, interval, duration, start_delay, hold, target_window, force_focus, self._stop_event, backend
-                )
-                msg = f"Finished. Sent {presses} presses of '{key}'." if not self._stop_event.is_set() else "Stopped."
-            self.root.after(0, self._finish_run, msg)
-        except Exception as exc:  # pragma: no cover - surfaced to UI
-            self.root.after(0, self._finish_run, f"Error: {exc}")
+    def _show_progress(self) -> None:
+        # The only place progress reaches Tk: one sample per frame, whatever the job rates.
+        jobs = self._engine.jobs()
+        count, rate, elapsed = self._progress.sample(jobs)
+        active = [job for job in jobs if job.started is not None and not job.done.is_set()]
+        if active:
+            minutes, seconds = divmod(int(elapsed), 60)
+            text = f"Running {len(active)} job(s): {count} sent, {rate:.1f}/s, {minutes}:{seconds:02d} elapsed"
+            timed = [job for job in active if job.timing and job.timing.count]
+            if timed:
+                p99 = max(job.timing.lateness.percentile(99) for job in timed)
+                text += f", p99 lateness {p99 * 1000:.2f} ms"
+            self.status_var.set(text)
+        if self._hotkey:
+            self.hook_stats_var.set(self._hotkey.describe())
+        if self._engine.active_jobs():
+            self.root.after(1000 // PROGRESS_FPS, self._show_progress)
+        else:
+            self._live_polling = False
+
+    def _finish_job(self, job: Job) -> None:
+        if job.state == "error":
+            self.status_var.set(f"Error: {job.error}")
+        elif job.state == "stopped":
+            self.status_var.set("Stopped.")
+        else:
+            what = "presses" if job.mode == "key" else "clicks"
+            self.status_var.set(f"Finished. Sent {job.count} {what} of '{job.target}'.")
+        self._set_running_state(bool(self._engine.active_jobs()))
+        self._refresh_jobs()
+
+    def _refresh_jobs(self) -> None:
+        self.jobs_list.delete(0, tk.END)
+        for job in self._engine.jobs():
+            self.jobs_list.insert(tk.END, job.describe())
+
+    def _clear_finished_jobs(self) -> None:
+        self._engine.forget_finished()
+        self._refresh_jobs()
 
-    def _finish_run(self, message: str) -> None:
-        self.status_var.set(message)
-        self._set_running_state(False)
+    def stop_selected_job(self) -> None:
+        jobs = self._engine.jobs()
+        for index in self.jobs_list.curselection():
+            if index < len(jobs):
+                jobs[index].stop()
+        self.status_var.set("Stopping...")
 
     def stop_spam(self) -> None:
-        if self._stop_event and not self._stop_event.is_set():
-            self._stop_event.set()
+        if self._engine.active_jobs():
+            self._engine.stop_all()
             self.status_var.set("Stopping...")
 
     def _set_running_state(self, running: bool) -> None:
-        self.start_btn.config(state=tk.DISABLED if running else tk.NORMAL)
         self.stop_btn.config(state=tk.NORMAL if running else tk.DISABLED)
 
     def _on_close(self) -> None:
-        if self._stop_event and not self._stop_event.is_set():
-            self._stop_event.set()
-            if self._hotkey_registered and self._hotkey_handle and HAS_KEYBOARD:
-                try:
-                    keyboard.remove_hotkey(self._hotkey_handle)
-                except Exception:
-                    pass
+        self._closing = True
+        self._engine.shutdown(timeout=1.0)  # bounded in case a dispatcher after() was already under way
+        if self._hotkey:
+            self._hotkey.close()
         self.root.destroy()
 
 
 def launch_gui() -> None:
+    global tk, messagebox, ttk
+    import tkinter as tk
+    from tkinter import messagebox, ttk
+
     root = tk.Tk()
     SpammerApp(root)
     root.mainloop()
@@ -484,10 +3764,37 @@ def launch_gui() -> None:
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Spam a key or mouse clicks at a fixed interval.")
     parser.add_argument("--gui", action="store_true", help="Force GUI mode (default when no args).")
-    parser.add_argument("--mode", choices=["key", "click"], default="key", help="Run in key or click mode (default: key).")
-    parser.add_argument("--key", help="Key name to press (e.g., 'space', 'a', 'enter').")
+    parser.add_argument(
+        "--mode",
+        choices=["key", "click", "sequence", "move"],
+        default="key",
+        help="Run in key, click, sequence or move (glide through --points) mode (default: key).",
+    )
+    parser.add_argument("--key", help="Key name or chord to press (e.g., 'space', 'a', 'enter', 'ctrl+c').")
     parser.add_argument("--button", default="left", help="Mouse button for click mode (left/right/middle).")
+    parser.add_argument("--sequence", help="Sequence file for sequence mode (.json, or a text script of steps).")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Passes of a sequence, --points pattern or move path; 0 = until duration/Ctrl+C (default: 1).",
+    )
+    parser.add_argument(
+        "--points",
+        help="Click each point in turn (click mode) or glide through them (move mode): X,Y;X,Y;... "
+        "or grid:LEFT,TOP,COLUMNS,ROWS,DX,DY.",
+    )
+    parser.add_argument(
+        "--glide",
+        type=float,
+        default=0,
+        help="Seconds spent gliding to each --points click (click mode) or along the whole path (move mode).",
+    )
     parser.add_argument("--interval", type=float, default=0.2, help="Seconds between actions (default: 0.2).")
+    parser.add_argument(
+        "--rate",
+        help="Target rate instead of --interval, e.g. 2000/s or 90/min. High rates are sent in batches per wakeup.",
+    )
     parser.add_argument(
         "--duration",
         type=float,
@@ -497,8 +3804,134 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument(
         "--start-delay", type=float, default=3, help="Delay before starting so you can focus the window (default: 3)."
     )
-    parser.add_argument("--hold", type=float, default=0, help="Hold time in seconds (0 = tap).")
-    parser.add_argument("--backend", choices=["pyautogui", "pydirectinput"], default="pyautogui", help="Input backend.")
+    parser.add_argument(
+        "--hold",
+        type=float,
+        default=0,
+        help="Hold time in seconds (0 = tap). Presses still start every interval; longer holds overlap.",
+    )
+    parser.add_argument(
+        "--jitter",
+        metavar="DIST",
+        help=(
+            "Randomize the interval (replaces --interval): uniform:LOW,HIGH, normal:MEAN,SD or "
+            "lognormal:MEDIAN,SIGMA in seconds, optionally followed by ,MIN,MAX bounds."
+        ),
+    )
+    parser.add_argument("--hold-jitter", metavar="DIST", help="Randomize each hold (replaces --hold); same format.")
+    parser.add_argument("--seed", type=int, help="Random seed for --jitter/--hold-jitter, for repeatable runs.")
+    parser.add_argument(
+        "--when",
+        metavar="CONDITION",
+        help=(
+            "Only act while the screen matches: pixel:X,Y,#RRGGBB, pixel:X,Y,W,H,#RRGGBB (any pixel in the area) "
+            "or image:PATH@LEFT,TOP,WIDTH,HEIGHT (template found in the area)."
+        ),
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Per-channel colour difference (0-255) still counted as a --when match.",
+    )
+    parser.add_argument(
+        "--check-rate",
+        type=float,
+        default=DEFAULT_CHECK_RATE,
+        help="Screen checks per second for --when (capture runs beside the scheduler).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=[name for name, cls in BACKENDS.items() if not cls.needs_arg],
+        default="pyautogui",
+        help="Input backend (xsend is chosen with --window-id).",
+    )
+    parser.add_argument(
+        "--catch-up",
+        choices=list(CATCH_UP_POLICIES),
+        default="skip",
+        help="When running late: skip missed actions or burst to catch up (default: skip).",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay resident and accept jobs over a local socket (see --send). Jobs start without --start-delay.",
+    )
+    parser.add_argument("--socket", help="Daemon socket path (default: per-user socket in the runtime/temp dir).")
+    parser.add_argument(
+        "--send",
+        nargs="+",
+        metavar="CMD",
+        help="Send a command to a running daemon: start SPEC | stop [ID] | status ID | list | shutdown.",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="Record keyboard (and mouse, with the 'mouse' package) input to FILE until --stop-key or --duration.",
+    )
+    parser.add_argument("--stop-key", default="esc", help="Key that ends --record (default: esc).")
+    parser.add_argument("--replay", metavar="FILE", help="Replay a recording made with --record.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (default: 1).")
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help=(
+            "Measure key and click call cost for every available backend and save the per-machine profile "
+            "used to warn about (or --clamp) unreachable rates. Sends real shift taps and clicks at the pointer."
+        ),
+    )
+    parser.add_argument(
+        "--clamp",
+        action="store_true",
+        help="Lower --interval/--rate to the calibrated sustainable rate instead of only warning.",
+    )
+    parser.add_argument(
+        "--benchmark",
+        nargs="?",
+        const="throughput",
+        choices=["throughput", "startup", "match"],
+        help=(
+            "Measure scheduler throughput with the null backend (default), cold start time, "
+            "or --when screen matching on synthetic images, then exit."
+        ),
+    )
+    parser.add_argument(
+        "--benchmark-seconds", type=float, default=1.0, help="Run time per benchmark case (default: 1)."
+    )
+    parser.add_argument("--benchmark-json", help="Also write benchmark results to this JSON file.")
+    parser.add_argument(
+        "--job",
+        action="append",
+        metavar="SPEC",
+        help=(
+            "Run several jobs together, e.g. --job key:a@0.1 --job click:left@1,hold=0.05. "
+            "Options: hold, duration, delay, backend, window, focus, catch_up, batch, window_id; "
+            "defaults come from the other flags."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        metavar="PATH",
+        help="Record per-action timing and write it to PATH (.csv for raw rows, otherwise JSON with histograms).",
+    )
+    parser.add_argument(
+        "--log",
+        metavar="PATH",
+        help="Write every action (time, lateness, call time, focus state) to a fixed-size binary ring file.",
+    )
+    parser.add_argument(
+        "--log-size",
+        type=int,
+        default=DEFAULT_LOG_CAPACITY,
+        help=f"Records kept by --log before the oldest are overwritten (default: {DEFAULT_LOG_CAPACITY}).",
+    )
+    parser.add_argument("--read-log", metavar="PATH", help="Summarize an event log (works while it is being written).")
+    parser.add_argument("--tail", type=int, default=10, help="Records shown by --read-log (default: 10).")
+    parser.add_argument("--follow", action="store_true", help="With --read-log, keep printing new records.")
+    parser.add_argument(
+        "--window-id",
+        help="X11 window id to post events to without focusing it (uses the xsend backend), e.g. 0x3a00007.",
+    )
     parser.add_argument("--target-window", help="Substring of target window title to focus before actions.")
     parser.add_argument("--force-focus", action="store_true", help="Activate target window before each action.")
     return parser.parse_args(argv)
@@ -510,39 +3943,286 @@ def main(argv: list[str]) -> None:
         return
 
     args = parse_args(argv)
+    if args.window_id:
+        try:
+            int(args.window_id, 0)
+        except ValueError:
+            sys.exit(f"Invalid --window-id '{args.window_id}'. Use a number such as 0x3a00007.")
+        args.backend = f"xsend:{args.window_id}"
     if args.gui:
         launch_gui()
         return
 
-    if args.mode == "click":
-        presses = spam_click(
-            args.button,
-            args.interval,
-            args.duration,
-            args.start_delay,
-            args.hold,
-            args.target_window,
-            args.force_focus,
-            None,
-            args.backend,
+    if args.benchmark:
+        if args.benchmark == "startup":
+            results = benchmark_startup()
+            print_startup_benchmark(results)
+        elif args.benchmark == "match":
+            results = benchmark_match()
+            print_match_benchmark(results)
+        else:
+            results = run_benchmark(seconds=args.benchmark_seconds)
+            print_benchmark(results)
+        if args.benchmark_json:
+            with open(args.benchmark_json, "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2)
+        return
+
+    if args.calibrate:
+        print(
+            f"Calibrating in {args.start_delay:g}s: sends {CALIBRATE_CALLS} shift taps and {CALIBRATE_CALLS} "
+            f"{args.button} clicks per backend at the pointer. Ctrl+C to abort."
         )
-        print(f"Done. Sent {presses} clicks of '{args.button}'.")
-    else:
-        if not args.key:
-            sys.exit("--key is required in key mode. Omit arguments to open the GUI.")
-        presses = spam_key(
-            args.key,
-            args.interval,
-            args.duration,
-            args.start_delay,
-            args.hold,
-            args.target_window,
-            args.force_focus,
-            None,
-            args.backend,
+        _wait_with_cancel(args.start_delay, None)
+        profile = calibrate(button=args.button)
+        print_calibration(profile)
+        print(f"Saved to {calibration_path()}")
+        return
+
+    if args.read_log:
+        try:
+            info, rows = read_log(args.read_log)
+        except (OSError, ValueError) as exc:
+            sys.exit(f"Cannot read log: {exc}")
+        if not args.follow:
+            print_log_summary(summarize_log(info, rows))
+        tail_log(args.read_log, args.tail, args.follow)
+        return
+
+    if args.send:
+        try:
+            reply = send_command(client_request(args.send), args.socket or default_socket_path())
+        except (OSError, ValueError) as exc:
+            sys.exit(f"Daemon request failed: {exc}")
+        print(json.dumps(reply))
+        if not reply.get("ok"):
+            sys.exit(1)
+        return
+
+    if args.daemon:
+        socket_path = args.socket or default_socket_path()
+        log = EventLog(args.log, args.log_size) if args.log else None
+        daemon = ControlDaemon(
+            socket_path,
+            [args.backend],
+            {
+                "duration": args.duration,
+                "start_delay": 0,
+                "hold": args.hold,
+                "backend": args.backend,
+                "catch_up": args.catch_up,
+                "log": log,
+            },
         )
-        print(f"Done. Sent {presses} presses of '{args.key}'.")
+        print(f"Listening on {socket_path}", flush=True)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if log:
+                log.close()
+        return
+
+    if args.record:
+        recorder = InputRecorder(args.record, args.stop_key)
+        _wait_with_cancel(args.start_delay, None)
+        recorder.start()
+        print(f"Recording to {args.record}; press '{args.stop_key}' to stop.", flush=True)
+        try:
+            # Poll so Ctrl+C is delivered promptly on every platform.
+            end_at = None if args.duration == 0 else time.perf_counter() + args.duration
+            while not recorder.stopped.wait(0.2):
+                if end_at is not None and time.perf_counter() >= end_at:
+                    break
+        except KeyboardInterrupt:
+            pass
+        print(f"Recorded {recorder.stop()} events.")
+        return
+
+    if args.replay:
+        try:
+            sent = replay_recording(args.replay, args.start_delay, None, args.backend, args.speed)
+        except (OSError, ValueError) as exc:
+            sys.exit(f"Cannot replay: {exc}")
+        print(f"Done. Replayed {sent} events.")
+        return
+
+    when = None
+    if args.when:
+        if (args.mode in ("sequence", "move") or args.points) and not args.job:
+            sys.exit("--when works with key and click modes (without --points) and --job.")
+        try:
+            when = parse_condition(args.when, args.tolerance)
+        except (OSError, ValueError) as exc:
+            sys.exit(str(exc))
+
+    if args.job and args.rate:
+        sys.exit("--rate does not apply to --job; give each job its own @INTERVAL (and batch=N for bursts).")
+
+    jitter = hold_jitter = None
+    if args.jitter or args.hold_jitter:
+        if args.job or args.mode in ("sequence", "move") or args.points:
+            sys.exit("--jitter and --hold-jitter work with key and click modes (without --points).")
+        if args.jitter and args.rate:
+            sys.exit("--jitter replaces --rate; use one or the other.")
+        try:
+            if args.hold_jitter and args.rate and plan_rate(parse_rate(args.rate))[1] > 1:
+                sys.exit(
+                    f"--hold-jitter cannot be combined with --rate above {MAX_WAKEUPS_PER_SEC}/s (holds do not batch)."
+                )
+            jitter = parse_jitter(args.jitter, args.seed) if args.jitter else None
+            # Offset the seed so both draw independent streams.
+            hold_seed = None if args.seed is None else args.seed + 1
+            hold_jitter = parse_jitter(args.hold_jitter, hold_seed) if args.hold_jitter else None
+        except ValueError as exc:
+            sys.exit(str(exc))
+
+    log = EventLog(args.log, args.log_size) if args.log else None
+    try:
+        if args.job:
+            try:
+                jobs = [
+                    parse_job_spec(
+                        spec,
+                        duration=args.duration,
+                        start_delay=args.start_delay,
+                        hold=args.hold,
+                        target_window=args.target_window,
+                        force_focus=args.force_focus,
+                        backend=args.backend,
+                        catch_up=args.catch_up,
+                        when=when,
+                        check_rate=args.check_rate,
+                        log=log,
+                    )
+                    for spec in args.job
+                ]
+            except ValueError as exc:
+                sys.exit(str(exc))
+            if args.stats:
+                for job in jobs:
+                    job.timing = TimingRecorder()
+            try:
+                run_jobs(jobs)
+            except ValueError as exc:  # e.g. an unknown backend or bad window_id in a job spec
+                sys.exit(str(exc))
+            if args.stats:
+                export_stats(args.stats, {f"job{job.id}": job.timing for job in jobs})
+            return
+
+        stats: dict = {}
+        timing = TimingRecorder() if args.stats else None
+        batch = 1
+        if args.rate:
+            try:
+                args.interval, batch = plan_rate(parse_rate(args.rate))
+            except ValueError as exc:
+                sys.exit(str(exc))
+        if args.mode in ("sequence", "move") or (args.mode == "click" and args.points):
+            if batch > 1:
+                # Steps run one per wakeup, so the batch plan_rate relies on cannot apply.
+                sys.exit(
+                    f"--rate above {MAX_WAKEUPS_PER_SEC}/s needs batching, which {args.mode} mode "
+                    f"{'with --points ' if args.points else ''}cannot use; lower the rate."
+                )
+            try:
+                if args.mode == "sequence":
+                    if not args.sequence:
+                        sys.exit("--sequence is required in sequence mode.")
+                    plan = compile_sequence(load_sequence(args.sequence))
+                elif not args.points:
+                    sys.exit("--points is required in move mode.")
+                elif args.mode == "move":
+                    plan = path_plan(mouse_path(parse_points(args.points), args.glide))
+                else:
+                    plan = click_pattern(parse_points(args.points), args.interval, args.button, args.glide)
+            except (OSError, ValueError) as exc:
+                sys.exit(f"Invalid {args.mode if args.mode != 'click' else 'click pattern'}: {exc}")
+            sent = run_sequence(
+                plan,
+                args.repeat,
+                args.duration,
+                args.start_delay,
+                args.target_window,
+                args.force_focus,
+                None,
+                args.backend,
+                args.catch_up,
+                stats,
+                timing,
+                log,
+            )
+            print(f"Done. Sent {sent} {args.mode} steps.")
+        elif args.mode == "click":
+            presses = spam_click(
+                args.button,
+                args.interval,
+                args.duration,
+                args.start_delay,
+                args.hold,
+                args.target_window,
+                args.force_focus,
+                None,
+                args.backend,
+                args.catch_up,
+                stats,
+                timing,
+                batch,
+                when,
+                args.check_rate,
+                args.clamp,
+                log,
+                jitter,
+                hold_jitter,
+            )
+            print(f"Done. Sent {presses} clicks of '{args.button}'.")
+        else:
+            if not args.key:
+                sys.exit("--key is required in key mode. Omit arguments to open the GUI.")
+            presses = spam_key(
+                args.key,
+                args.interval,
+                args.duration,
+                args.start_delay,
+                args.hold,
+                args.target_window,
+                args.force_focus,
+                None,
+                args.backend,
+                args.catch_up,
+                stats,
+                timing,
+                batch,
+                when,
+                args.check_rate,
+                args.clamp,
+                log,
+                jitter,
+                hold_jitter,
+            )
+            print(f"Done. Sent {presses} presses of '{args.key}'.")
+        if "focus_checks" in stats:
+            print(f"Focus: {stats['focus_activations']} activations in {stats['focus_checks']} checks.")
+        if "screen_checks" in stats:
+            print(
+                f"Screen: {stats['screen_misses']} deadlines skipped, {stats['screen_checks']} checks "
+                f"({stats['screen_changes']} changed frames)."
+            )
+        if jitter:
+            print(format_jitter("Interval", jitter.report()))
+        if hold_jitter:
+            print(format_jitter("Hold", hold_jitter.report()))
+        if timing:
+            print(f"Timing: {format_timing(timing)}")
+            export_stats(args.stats, {"run": timing})
+    finally:
+        if log:
+            log.close()
 
 
 if __name__ == "__main__":
-    main(sys.argv[1:])
+    try:
+        main(sys.argv[1:])
+    except RuntimeError as exc:  # missing optional dependency, window not found, ...
+        sys.exit(str(exc))